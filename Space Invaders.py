@@ -1,106 +1,778 @@
 # Space Invaders (v.1.8)
 # code by G.G.Otto
 
-import turtle
 from tkinter import *
 import tkinter.messagebox as message
 import time
 import random
 import os
+import heapq
+import math
+import argparse
+import bisect
+import struct
+import zlib
+import base64
+import json
+import sys
+import subprocess
+import tracemalloc
+import collections
+import sqlite3
+import glob
+import queue
+import concurrent.futures
+import fractions
+import copy
+import hashlib
+import multiprocessing
 
-class Player(turtle.RawTurtle):
-    '''represents the player'''
+# folder the images are kept in, next to this file
+ASSET_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# rgb of the named colors the game draws with
+COLORS = {"black": (0,0,0), "white": (255,255,255), "red": (255,0,0), "lime": (0,255,0),
+    "yellow": (255,255,0), "hot pink": (255,105,180), "blue": (0,0,255), "dark grey": (169,169,169),
+    "dark orange": (255,140,0), "gold": (255,215,0), "brown": (165,42,42)}
+
+# 5x7 letters for drawing text without tkinter, one row of bits per line from the top
+FONT = {"A": (14,17,17,31,17,17,17), "B": (30,17,17,30,17,17,30), "C": (14,17,16,16,16,17,14),
+    "D": (30,17,17,17,17,17,30), "E": (31,16,16,30,16,16,31), "F": (31,16,16,30,16,16,16),
+    "G": (14,17,16,23,17,17,15), "H": (17,17,17,31,17,17,17), "I": (14,4,4,4,4,4,14),
+    "J": (7,2,2,2,2,18,12), "K": (17,18,20,24,20,18,17), "L": (16,16,16,16,16,16,31),
+    "M": (17,27,21,21,17,17,17), "N": (17,17,25,21,19,17,17), "O": (14,17,17,17,17,17,14),
+    "P": (30,17,17,30,16,16,16), "Q": (14,17,17,17,21,18,13), "R": (30,17,17,30,20,18,17),
+    "S": (15,16,16,14,1,1,30), "T": (31,4,4,4,4,4,4), "U": (17,17,17,17,17,17,14),
+    "V": (17,17,17,17,17,10,4), "W": (17,17,17,21,21,21,10), "X": (17,17,10,4,10,17,17),
+    "Y": (17,17,10,4,4,4,4), "Z": (31,1,2,4,8,16,31), "0": (14,17,19,21,25,17,14),
+    "1": (4,12,4,4,4,4,14), "2": (14,17,1,2,4,8,31), "3": (31,2,4,2,1,17,14), "4": (2,6,10,18,31,2,2),
+    "5": (31,16,30,1,1,17,14), "6": (6,8,16,30,17,17,14), "7": (31,1,2,4,8,8,8), "8": (14,17,17,14,17,17,14),
+    "9": (14,17,17,15,1,2,12), ":": (0,12,12,0,12,12,0), "!": (4,4,4,4,4,0,4), "-": (0,0,0,31,0,0,0),
+    ".": (0,0,0,0,0,12,12), "?": (14,17,1,2,4,0,4), " ": (0,0,0,0,0,0,0)}
+
+def encode_png(width, height, pixels, hasAlpha=True):
+    '''encode_png(width, height, pixels, hasAlpha=True) -> bytes
+    returns a png image of pixels, RGBA bytes row by row from the top,
+    or RGB bytes if hasAlpha is False'''
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind+data))
+
+    # every row starts with filter type 0
+    stride = width*(4 if hasAlpha else 3)
+    raw = b"".join(b"\0" + bytes(pixels[row*stride:(row+1)*stride]) for row in range(height))
+    header = struct.pack(">IIBBBBB", width, height, 8, 6 if hasAlpha else 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(raw, 1)) + \
+        chunk(b"IEND", b"")
+
+def draw_ring(radius, thickness, rgb):
+    '''draw_ring(radius, thickness, rgb) -> int, bytearray
+    returns the size and RGBA pixels of a square image with a ring of
+    color rgb and thickness around its center'''
+    outer = radius + thickness/2
+    inner = max(radius - thickness/2, 0)
+    center = math.ceil(outer)
+    size = center*2 + 1
+    pixels = bytearray(size*size*4)
+    color = bytes(rgb) + b"\xff"
+
+    for y in range(size):
+        for x in range(size):
+            if inner**2 <= (x-center)**2 + (y-center)**2 <= outer**2:
+                pixels[(y*size+x)*4:(y*size+x)*4+4] = color
+    return size, pixels
+
+def draw_text(text, size, rgb):
+    '''draw_text(text, size, rgb) -> int, int, bytearray
+    returns the width, height and RGBA pixels of text in FONT with color rgb,
+    each pixel of a letter drawn as a size x size square'''
+    width = max(len(text)*6 - 1, 0)*size
+    height = 7*size
+    pixels = bytearray(width*height*4)
+    color = (bytes(rgb) + b"\xff")*size
+    for index, letter in enumerate(text.upper()):
+        for row, bits in enumerate(FONT.get(letter, FONT["?"])):
+            for column in range(5):
+                if bits & (16 >> column):
+                    x = (index*6 + column)*size
+                    for y in range(row*size, (row+1)*size):
+                        pixels[(y*width+x)*4:(y*width+x+size)*4] = color
+    return width, height, pixels
+
+def scale_pixels(width, height, pixels, newWidth, newHeight):
+    '''scale_pixels(width, height, pixels, newWidth, newHeight) -> bytearray
+    returns the RGBA pixels of a width x height image stretched to newWidth x newHeight'''
+    if (width, height) == (newWidth, newHeight):
+        return pixels
+    scaled = bytearray(newWidth*newHeight*4)
+    columns = [min(x*width//newWidth, width-1) for x in range(newWidth)]
+    for y in range(newHeight):
+        start = min(y*height//newHeight, height-1)*width
+        row = b"".join(pixels[(start+column)*4:(start+column)*4+4] for column in columns)
+        scaled[y*newWidth*4:(y+1)*newWidth*4] = row
+    return scaled
+
+def read_image_size(data):
+    '''read_image_size(data) -> str, int, int
+    returns the format ("gif" or "png"), width and height of an image
+    raises ValueError if data is not a gif or png'''
+    if data[:6] in (b"GIF87a", b"GIF89a") and len(data) >= 10:
+        width, height = struct.unpack("<HH", data[6:10])
+        return "gif", width, height
+    if data[:8] == b"\x89PNG\r\n\x1a\n" and data[12:16] == b"IHDR" and len(data) >= 24:
+        width, height = struct.unpack(">II", data[16:24])
+        return "png", width, height
+    raise ValueError("not a gif or png image")
+
+def draw_saucer(width, height):
+    '''draw_saucer(width, height) -> bytearray
+    returns the RGBA pixels of a plain flying saucer that fills width x height'''
+    pixels = bytearray(width*height*4)
+    body = bytes(COLORS["dark grey"]) + b"\xff"
+    dome = bytes(COLORS["blue"]) + b"\xff"
+    centerX = (width-1)/2
+    for y in range(height):
+        for x in range(width):
+            # dome on the top half, a flat disk through the middle
+            dx = (x-centerX)/(width/2)
+            if ((x-centerX)/(width/4))**2 + ((y-height/2)/(height/2))**2 <= 1 and y < height/2:
+                pixels[(y*width+x)*4:(y*width+x)*4+4] = dome
+            elif dx**2 + ((y-height*0.6)/(height/4))**2 <= 1:
+                pixels[(y*width+x)*4:(y*width+x)*4+4] = body
+    return pixels
+
+def decode_lzw(data, minCodeSize):
+    '''decode_lzw(data, minCodeSize) -> bytearray
+    returns the color indices packed in the lzw data of a gif image'''
+    clear = 1 << minCodeSize
+    end = clear + 1
+    codeSize = minCodeSize + 1
+    table = [bytes([index]) for index in range(clear)] + [b"", b""]
+    indices = bytearray()
+    previous = None
+    buffer = 0
+    numBits = 0
+
+    for byte in data:
+        buffer |= byte << numBits
+        numBits += 8
+        while numBits >= codeSize:
+            code = buffer & ((1 << codeSize) - 1)
+            buffer >>= codeSize
+            numBits -= codeSize
+
+            if code == clear:
+                del table[clear+2:]
+                codeSize = minCodeSize + 1
+                previous = None
+                continue
+            if code == end:
+                return indices
+
+            if previous == None:
+                entry = table[code]
+            elif code < len(table):
+                entry = table[code]
+                table.append(previous + entry[:1])
+            else:
+                entry = previous + previous[:1]
+                table.append(entry)
+            indices += entry
+            previous = entry
+
+            # codes get a bit longer once the table fills up, to at most 12 bits
+            if len(table) == 1 << codeSize and codeSize < 12:
+                codeSize += 1
+    return indices
+
+def decode_gif(data):
+    '''decode_gif(data) -> int, int, bytearray, bool
+    returns the width, height and RGBA pixels (row by row from the top) of the
+    first image of a gif, and if it has a transparent color
+    raises ValueError if data is not a gif it can read'''
+    if data[:6] not in (b"GIF87a", b"GIF89a") or len(data) < 13:
+        raise ValueError("not a gif image")
+    width, height, flags = struct.unpack_from("<HHB", data, 6)
+    pos = 13
+    palette = None
+    if flags & 0x80:
+        palette = data[pos:pos + (3 << ((flags & 7) + 1))]
+        pos += len(palette)
+    transparent = None
+
+    try:
+        while data[pos] != 0x3b:
+            # extension: only the transparent color of graphic control matters
+            if data[pos] == 0x21:
+                if data[pos+1] == 0xf9 and data[pos+2] >= 4 and data[pos+3] & 1:
+                    transparent = data[pos+6]
+                pos += 2
+                while data[pos] != 0:
+                    pos += data[pos] + 1
+                pos += 1
+                continue
+
+            if data[pos] != 0x2c:
+                raise ValueError("broken gif image")
+
+            # image
+            left, top, frameWidth, frameHeight, flags = struct.unpack_from("<HHHHB", data, pos+1)
+            pos += 10
+            if flags & 0x80:
+                palette = data[pos:pos + (3 << ((flags & 7) + 1))]
+                pos += len(palette)
+            if palette == None:
+                raise ValueError("gif image has no colors")
+            minCodeSize = data[pos]
+            pos += 1
+            chunks = []
+            while data[pos] != 0:
+                chunks.append(data[pos+1:pos+1+data[pos]])
+                pos += data[pos] + 1
+            indices = decode_lzw(b"".join(chunks), minCodeSize)
+
+            # order of the rows, interlaced images send every 8th row first
+            rows = list(range(frameHeight))
+            if flags & 0x40:
+                rows = rows[0::8] + rows[4::8] + rows[2::4] + rows[1::2]
+
+            pixels = bytearray(width*height*4)
+            for index, row in enumerate(rows):
+                if top+row >= height:
+                    continue
+                for column in range(min(frameWidth, width-left)):
+                    color = indices[index*frameWidth+column] if index*frameWidth+column < len(indices) else 0
+                    if color != transparent:
+                        start = ((top+row)*width + left+column)*4
+                        pixels[start:start+3] = palette[color*3:color*3+3]
+                        pixels[start+3] = 255
+            return width, height, pixels, transparent != None
+    except IndexError:
+        raise ValueError("gif image is cut short")
+    raise ValueError("gif has no image")
+
+def decode_png(data):
+    '''decode_png(data) -> int, int, bytearray, bool
+    returns the width, height and RGBA pixels (row by row from the top) of a png,
+    and if it has transparency
+    raises ValueError if data is not an 8 bit, non-interlaced png'''
+    if data[:8] != b"\x89PNG\r\n\x1a\n":
+        raise ValueError("not a png image")
+    pos = 8
+    header = None
+    palette = b""
+    transparency = None
+    chunks = []
+    while pos + 8 <= len(data):
+        length, kind = struct.unpack_from(">I4s", data, pos)
+        body = data[pos+8:pos+8+length]
+        pos += length + 12
+        if kind == b"IHDR":
+            header = struct.unpack(">IIBBBBB", body)
+        elif kind == b"PLTE":
+            palette = body
+        elif kind == b"tRNS":
+            transparency = body
+        elif kind == b"IDAT":
+            chunks.append(body)
+        elif kind == b"IEND":
+            break
+    if header == None or len(chunks) == 0:
+        raise ValueError("png image is cut short")
+
+    width, height, depth, colorType, compression, filtering, interlace = header
+    channels = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}.get(colorType)
+    if depth != 8 or interlace != 0 or channels == None:
+        raise ValueError("only 8 bit, non-interlaced pngs can be read")
+    try:
+        raw = zlib.decompress(b"".join(chunks))
+    except zlib.error:
+        raise ValueError("broken png image")
+
+    # undo the filter of each row
+    stride = width*channels
+    if len(raw) < (stride+1)*height:
+        raise ValueError("png image is cut short")
+    rows = []
+    previous = bytearray(stride)
+    for row in range(height):
+        kind = raw[row*(stride+1)]
+        line = bytearray(raw[row*(stride+1)+1:(row+1)*(stride+1)])
+        for index in range(stride):
+            left = line[index-channels] if index >= channels else 0
+            up = previous[index]
+            if kind == 1:
+                line[index] = (line[index] + left) & 255
+            elif kind == 2:
+                line[index] = (line[index] + up) & 255
+            elif kind == 3:
+                line[index] = (line[index] + (left + up)//2) & 255
+            elif kind == 4:
+                upLeft = previous[index-channels] if index >= channels else 0
+                guess = left + up - upLeft
+                # paeth: whichever neighbour is closest to the guess
+                closest = min((abs(guess-left), 0, left), (abs(guess-up), 1, up), (abs(guess-upLeft), 2, upLeft))[2]
+                line[index] = (line[index] + closest) & 255
+        rows.append(line)
+        previous = line
+
+    # to RGBA
+    pixels = bytearray(width*height*4)
+    for row, line in enumerate(rows):
+        for column in range(width):
+            start = (row*width + column)*4
+            values = line[column*channels:(column+1)*channels]
+            if colorType == 3:
+                rgba = bytes(palette[values[0]*3:values[0]*3+3]) + \
+                    bytes([transparency[values[0]] if transparency != None and values[0] < len(transparency) else 255])
+            elif colorType == 0 or colorType == 4:
+                rgba = bytes([values[0]]*3 + [values[1] if colorType == 4 else 255])
+            else:
+                rgba = bytes(values[:3]) + bytes([values[3] if colorType == 6 else 255])
+            pixels[start:start+4] = rgba
+    return width, height, pixels, colorType in (4, 6) or transparency != None
+
+def decode_image(data):
+    '''decode_image(data) -> int, int, bytearray, bool
+    returns the width, height, RGBA pixels and if there is transparency of a gif or png
+    raises ValueError if data is not a gif or png it can read'''
+    if read_image_size(data)[0] == "gif":
+        return decode_gif(data)
+    return decode_png(data)
+
+def sweep_box(x0, y0, x1, y1, left, bottom, right, top):
+    '''sweep_box(x0, y0, x1, y1, left, bottom, right, top) -> float
+    returns how far along the segment from (x0,y0) to (x1,y1), from 0 to 1,
+    it first touches the box, or None if it misses the box'''
+    first = 0
+    last = 1
+    for start, end, low, high in ((x0, x1, left, right), (y0, y1, bottom, top)):
+        change = end - start
+        if change == 0:
+            if start < low or start > high:
+                return None
+            continue
+        enter = (low-start)/change
+        leave = (high-start)/change
+        if enter > leave:
+            enter, leave = leave, enter
+        first = max(first, enter)
+        last = min(last, leave)
+        if first > last:
+            return None
+    return first
+
+class Hitmask:
+    '''the solid pixels of a sprite, one int of bits per row, for pixel exact hits'''
+
+    def __init__(self, width, height, pixels):
+        '''Hitmask(width, height, pixels) -> Hitmask
+        the mask of a width x height sprite with RGBA pixels, where a pixel is solid
+        if it is not transparent and not black, which is the same as the background'''
+        self.width = width
+        self.height = height
+        self.rows = [] # row from the top -> bits, bit x is set if column x is solid
+        for y in range(height):
+            bits = 0
+            for x in range(width):
+                start = (y*width + x)*4
+                if pixels[start+3] >= 128 and pixels[start:start+3] != b"\0\0\0":
+                    bits |= 1 << x
+            self.rows.append(bits)
+
+        # tightest box around the solid pixels, from the middle of the sprite with y up
+        solid = [y for y in range(height) if self.rows[y] != 0]
+        if len(solid) == 0:
+            self.bounds = None
+            return
+        allBits = 0
+        for bits in self.rows:
+            allBits |= bits
+        lowest = (allBits & -allBits).bit_length() - 1
+        self.bounds = (lowest - width/2, height/2 - solid[-1] - 1,
+            allBits.bit_length() - width/2, height/2 - solid[0])
+
+    def get_bounds(self):
+        '''Hitmask.get_bounds() -> tuple
+        returns the left, bottom, right and top of the solid pixels
+        from the middle of the sprite, or None if no pixel is solid'''
+        return self.bounds
+
+    def get_count(self):
+        '''Hitmask.get_count() -> int
+        returns the number of solid pixels'''
+        return sum(bin(bits).count("1") for bits in self.rows)
+
+    def is_solid(self, x, y):
+        '''Hitmask.is_solid(x, y) -> bool
+        returns if the pixel at (x,y) from the middle of the sprite is solid'''
+        column = math.floor(x + self.width/2)
+        row = math.floor(self.height/2 - y)
+        if column < 0 or column >= self.width or row < 0 or row >= self.height:
+            return False
+        return (self.rows[row] >> column) & 1 == 1
+
+    def sweep(self, x0, y0, x1, y1):
+        '''Hitmask.sweep(x0, y0, x1, y1) -> float
+        returns how far along the segment from (x0,y0) to (x1,y1), from 0 to 1,
+        from the middle of the sprite, it first touches a solid pixel, or None if it misses'''
+        # most segments miss the box around the pixels
+        if self.bounds == None:
+            return None
+        distance = sweep_box(x0, y0, x1, y1, *self.bounds)
+        if distance == None:
+            return None
+
+        # then walk the pixels the segment goes through, one at a time
+        columnChange = x1 - x0
+        rowChange = y0 - y1 # rows go down
+        column = x0 + columnChange*distance + self.width/2
+        row = self.height/2 - y0 + rowChange*distance
+        times = [] # for columns then rows: (step, distance to the next pixel edge, distance between edges)
+        for change, pos in ((columnChange, column), (rowChange, row)):
+            if change > 0:
+                times.append([1, (math.floor(pos)+1-pos)/change + distance, 1/change])
+            elif change < 0:
+                times.append([-1, (math.floor(pos)-pos)/change + distance, -1/change])
+            else:
+                times.append([0, math.inf, math.inf])
+        column = math.floor(column)
+        row = math.floor(row)
+        while distance <= 1:
+            if 0 <= column < self.width and 0 <= row < self.height and (self.rows[row] >> column) & 1:
+                return distance
+            if times[0][1] < times[1][1]:
+                distance = times[0][1]
+                column += times[0][0]
+                times[0][1] += times[0][2]
+            else:
+                distance = times[1][1]
+                row += times[1][0]
+                times[1][1] += times[1][2]
+            if (column < 0 and columnChange < 0) or (column >= self.width and columnChange > 0) or \
+                    (row < 0 and rowChange < 0) or (row >= self.height and rowChange > 0):
+                return None
+        return None
+
+class CollisionGrid:
+    '''a uniform spatial hash that finds what a point might collide with'''
+
+    def __init__(self, x, y, width, height, cellSize):
+        '''CollisionGrid(x, y, width, height, cellSize) -> CollisionGrid
+        covers a width x height area centered at (x,y) with square cells
+        anything outside the area goes in the nearest edge cell'''
+        self.left = x - width/2
+        self.bottom = y - height/2
+        self.cellSize = cellSize
+        self.numColumns = max(math.ceil(width/cellSize), 1)
+        self.numRows = max(math.ceil(height/cellSize), 1)
+        self.cells = [[] for i in range(self.numColumns*self.numRows)]
+        self.places = {} # object -> (column range, row range)
+
+    def get_column(self, x):
+        '''CollisionGrid.get_column(x) -> int
+        returns the column holding x'''
+        return min(max(int((x-self.left)//self.cellSize), 0), self.numColumns-1)
+
+    def get_row(self, y):
+        '''CollisionGrid.get_row(y) -> int
+        returns the row holding y'''
+        return min(max(int((y-self.bottom)//self.cellSize), 0), self.numRows-1)
+
+    def insert(self, obj, left, bottom, right, top):
+        '''CollisionGrid.insert(obj, left, bottom, right, top) -> None
+        puts obj in every cell its box touches, moving it if already inserted'''
+        # the same as get_column and get_row, written out as this runs whenever anything moves
+        size, lastColumn, lastRow = self.cellSize, self.numColumns-1, self.numRows-1
+        place = (min(max(int((left-self.left)//size), 0), lastColumn),
+            min(max(int((right-self.left)//size), 0), lastColumn),
+            min(max(int((bottom-self.bottom)//size), 0), lastRow),
+            min(max(int((top-self.bottom)//size), 0), lastRow))
+        if self.places.get(obj) == place:
+            return
+
+        self.remove(obj)
+        self.places[obj] = place
+        for row in range(place[2], place[3]+1):
+            for column in range(place[0], place[1]+1):
+                self.cells[row*self.numColumns+column].append(obj)
+
+    def remove(self, obj):
+        '''CollisionGrid.remove(obj) -> None
+        takes obj out of the grid'''
+        place = self.places.pop(obj, None)
+        if place == None:
+            return
+
+        for row in range(place[2], place[3]+1):
+            for column in range(place[0], place[1]+1):
+                self.cells[row*self.numColumns+column].remove(obj)
+
+    def clear(self):
+        '''CollisionGrid.clear() -> None
+        takes everything out of the grid'''
+        for cell in self.cells:
+            cell.clear()
+        self.places.clear()
+
+    def query(self, x, y):
+        '''CollisionGrid.query(x, y) -> list
+        returns everything whose cells hold (x,y)'''
+        return self.cells[self.get_row(y)*self.numColumns+self.get_column(x)]
+
+    def query_segment(self, x0, y0, x1, y1):
+        '''CollisionGrid.query_segment(x0, y0, x1, y1) -> list
+        returns everything whose cells might touch the segment from (x0,y0) to (x1,y1)'''
+        left, right = self.get_column(min(x0, x1)), self.get_column(max(x0, x1))
+        bottom, top = self.get_row(min(y0, y1)), self.get_row(max(y0, y1))
+        if left == right and bottom == top:
+            return self.cells[bottom*self.numColumns+left]
 
-    def __init__(self, master, numBullets, cooldown):
-        '''Player(master, numBullets, cooldown) -> Player
-        the player for the game'''
-        turtle.RawTurtle.__init__(self, master.get_screen())
-        self.pu()
-        self.shape("player.gif")
-        self.goto(0,-275)
-        self.last = 0
+        found = []
+        for row in range(bottom, top+1):
+            for column in range(left, right+1):
+                for obj in self.cells[row*self.numColumns+column]:
+                    if obj not in found:
+                        found.append(obj)
+        return found
+
+class Player:
+    '''represents the player'''
+    def __init__(self, master, numBullets, cooldown, speed=500, bottom=75, bulletSpeed=1000/3):
+        '''Player(master, numBullets, cooldown, speed=500, bottom=75, bulletSpeed=1000/3) -> Player
+        the player for the game, bottom above the bottom of the field,
+        moving speed and shooting bullets bulletSpeed world units per second'''
+        self.x = 0
+        self.y = -master.get_height()/2 + bottom
         self.cooldown = cooldown
-        self.bullets = [Bullet(master, "yellow", master.get_aliens()) for i in range(numBullets)]
+        self.last = -cooldown
+        self.bullets = BulletPool(master, numBullets, "yellow", master.get_aliens(), speed=bulletSpeed)
         self.master = master
-        self.speed = 20
-        self.isMoving = False
+        self.speed = speed
+        self.isBroken = False
+        self.mask = master.get_assets().get_mask("player")
+        self.update_collisions()
+
+    def pos(self):
+        '''Player.pos() -> tuple
+        returns the position of the player'''
+        return self.x, self.y
+
+    def xcor(self):
+        '''Player.xcor() -> float
+        returns the x coordinate of the player'''
+        return self.x
+
+    def ycor(self):
+        '''Player.ycor() -> float
+        returns the y coordinate of the player'''
+        return self.y
+
+    def setx(self, x):
+        '''Player.setx(x) -> None
+        moves the player to x'''
+        self.x = x
+        self.update_collisions()
+
+    def get_box(self):
+        '''Player.get_box() -> tuple
+        returns the left, bottom, right and top of the player's hitbox'''
+        left, bottom, right, top = self.mask.get_bounds()
+        return self.x+left, self.y+bottom, self.x+right, self.y+top
+
+    def sweep(self, x0, y0, x1, y1):
+        '''Player.sweep(x0, y0, x1, y1) -> float
+        returns how far along the segment from (x0,y0) to (x1,y1), from 0 to 1,
+        it first hits the player, or None if it misses'''
+        return self.mask.sweep(x0-self.x, y0-self.y, x1-self.x, y1-self.y)
+
+    def update_collisions(self):
+        '''Player.update_collisions() -> None
+        moves the player's box in the collision grid'''
+        self.master.get_collisions().insert(self, *self.get_box())
+
+    def is_broken(self):
+        '''Player.is_broken() -> bool
+        returns if the player has been destroyed'''
+        return self.isBroken
 
-        # key bindings
-        canvas = master.get_canvas()
-        canvas.bind_all("<space>",self.shoot)
-        canvas.bind_all("<Up>",self.shoot)
-        canvas.bind_all("<Left>",self.move_left)
-        canvas.bind_all("<Right>",self.move_right)
-        
     def get_bullets(self):
         '''Player.get_bullets() -> list
         returns a list with all player's bullets'''
-        return self.bullets
+        return self.bullets.get_bullets()
+
+    def set_cooldown(self, cooldown):
+        '''Player.set_cooldown(cooldown) -> None
+        sets the seconds between shots'''
+        self.cooldown = cooldown
 
-    def minus_cooldown(self, minus):
-        '''Player.minus_cooldown(minus) -> None
-        minuses from cooldown'''
-        if self.cooldown > 0.85:
-            self.cooldown -= minus
+    def get_shot_tick(self, tick, tickTime):
+        '''Player.get_shot_tick(tick, tickTime) -> int
+        returns the first tick from tick on, with ticks tickTime milliseconds long,
+        at which holding shoot fires a bullet, or None if every bullet is flying'''
+        if all(bullet.is_moving() for bullet in self.bullets):
+            return None
+        # start just before the cooldown ends and check the way shoot does
+        tick = max(tick, math.floor((self.last + self.cooldown)*1000/tickTime) - 1)
+        while tick*tickTime/1000 - self.last < self.cooldown:
+            tick += 1
+        return tick
 
-    def shoot(self,event=''):
-        '''Player.shoot(event='') -> None
+    def shoot(self):
+        '''Player.shoot() -> None
         shoots a bullet'''
-        if time.time() - self.last < self.cooldown:
+        if self.master.get_time() - self.last < self.cooldown:
             return
 
         for bullet in self.bullets:
             if not bullet.is_moving():
-                self.last = time.time()
-                bullet.launch((self.xcor(), self.ycor()+20), 90)
+                self.last = self.master.get_time()
+                bullet.launch((self.x, self.y+20), 90)
                 return
 
-    def move_left(self, event=''):
-        '''Player.move_left(event) -> None
-        moves the player to the left'''
-        width = self.master.get_screen().window_width()
-        if self.master.is_over() or self.isMoving or \
-           -width/2+25 >= self.xcor():
-            return
+    def move(self, distance):
+        '''Player.move(distance) -> None
+        moves the player distance to the right (left if negative), staying on the screen'''
+        edge = self.master.get_width()/2 - 25
+        x = min(max(self.x + distance, -edge), edge)
+        if x != self.x:
+            self.x = x
+            self.update_collisions()
+            if self.master.is_player_reached():
+                self.master.request_checkup()
 
-        self.isMoving = True
-        self.bk(self.speed)
-        self.master.get_screen().update()
-        self.isMoving = False
+    def get_speed(self):
+        '''Player.get_speed() -> float
+        returns how fast the player moves in world units per second'''
+        return self.speed
 
-    def move_right(self, event=''):
-        '''Player.move_right(event) -> None
-        moves the player to the right'''
-        width = self.master.get_screen().window_width()
-        if self.master.is_over() or self.isMoving or \
-           self.xcor() >= width/2-25:
+    def get_drift(self, numTicks, dt):
+        '''Player.get_drift(numTicks, dt) -> tuple
+        returns how far (left, right) the keys held down may move the player in numTicks ticks of dt seconds'''
+        controls = self.master.get_controls()
+        distance = min(self.speed*dt*numTicks, self.master.get_width())
+        if controls.is_held("left") and not controls.is_held("right"):
+            return distance, 0
+        elif controls.is_held("right") and not controls.is_held("left"):
+            return 0, distance
+        return 0, 0
+
+    def get_ticks_outside(self, left, right, dt):
+        '''Player.get_ticks_outside(left, right, dt) -> int
+        returns how many ticks of dt seconds the keys held down can move the
+        player for before its x might be from left to right'''
+        controls = self.master.get_controls()
+        if controls.is_held("left") == controls.is_held("right"):
+            return math.inf
+        if left <= self.x <= right:
+            return 0
+        distance = self.speed*dt
+        if controls.is_held("right") and self.x < left:
+            return int((left - self.x - 1e-6)/distance)
+        if controls.is_held("left") and self.x > right:
+            return int((self.x - right - 1e-6)/distance)
+        return math.inf
+
+    def glide(self, numTicks, dt):
+        '''Player.glide(numTicks, dt) -> None
+        moves for the keys held down over numTicks ticks of dt seconds each, ending
+        where numTicks calls to update would if they did not shoot or reach the aliens'''
+        controls = self.master.get_controls()
+        if controls.is_held("left") and not controls.is_held("right"):
+            distance = -self.speed*dt
+        elif controls.is_held("right") and not controls.is_held("left"):
+            distance = self.speed*dt
+        else:
             return
 
-        self.isMoving = True
-        self.fd(self.speed)
-        self.master.get_screen().update()
-        self.isMoving = False
-        
-class Bullet(turtle.RawTurtle):
+        # add the steps one at a time, so the rounding is the same as moving every tick,
+        # and as it only goes one way it stops at the edge once it gets past it
+        edge = self.master.get_width()/2 - 25
+        x = self.x
+        for tick in range(numTicks):
+            x += distance
+        x = min(max(x, -edge), edge)
+        if x != self.x:
+            self.x = x
+            self.update_collisions()
+
+    def update(self, dt):
+        '''Player.update(dt) -> None
+        moves and shoots for the keys held down over dt seconds'''
+        controls = self.master.get_controls()
+        if controls.is_held("left") and not controls.is_held("right"):
+            self.move(-self.speed*dt)
+        elif controls.is_held("right") and not controls.is_held("left"):
+            self.move(self.speed*dt)
+        if controls.is_held("shoot"):
+            self.shoot()
+
+class Bullet:
     '''represent's the player's bullet'''
 
-    def __init__(self, master, color, aliens=None, radius=16, wait=30):
-        '''Bullet(master, color, aliens=None) -> Bullet
-        creates a bullet at the position of shootFrom'''
-        turtle.RawTurtle.__init__(self, master.get_screen())
-        self.pu()
-        self.ht()
-        self.shape("triangle")
-        self.color(color)
-        self.initColor = color
-        self.shapesize(0.2,0.7)
-        self.isMoving = False
-        self.exploding = False
+    # colors, largest radius and growth of each kind of explosion
+    alienExplosions = {1: (["red","lime"], 40, 5), 2: (["red","yellow"], 40, 5), 3: (["red","hot pink"], 40, 5)}
+    spaceshipExplosion = (["blue","blue","blue","dark grey","dark grey"], 50, 7)
+    playerExplosion = (["red","dark orange","gold"], 30, 5)
+
+    __slots__ = ("x", "y", "heading", "dx", "dy", "color", "isMoving", "isVisible", "exploding",
+        "expColors", "expSpeed", "expPos", "expStart", "numExplosions", "master", "aliens", "radius", "speed")
+
+    def __init__(self, master, color, aliens=None, radius=16, speed=1000/3):
+        '''Bullet(master, color, aliens=None, radius=16, speed=1000/3) -> Bullet
+        creates a bullet that flies speed world units per second
+        a bullet with aliens can shoot them, one without can shoot the player'''
+        self.x = 0
+        self.y = 0
+        self.heading = 90
+        self.dx = 0
+        self.dy = 1
+        self.color = color
         self.master = master
         self.aliens = aliens
         self.radius = radius
-        self.pensize(5)
-        self.wait = wait
+        self.speed = speed
+        self.numExplosions = 0
+        self.reset()
+
+    def reset(self):
+        '''Bullet.reset() -> None
+        stops the bullet and any explosion so it can be used again'''
+        self.isMoving = False
+        self.isVisible = False
+        self.exploding = False
+
+    def pos(self):
+        '''Bullet.pos() -> tuple
+        returns the position of the bullet'''
+        return self.x, self.y
+
+    def xcor(self):
+        '''Bullet.xcor() -> float
+        returns the x coordinate of the bullet'''
+        return self.x
+
+    def ycor(self):
+        '''Bullet.ycor() -> float
+        returns the y coordinate of the bullet'''
+        return self.y
+
+    def goto(self, x, y=None):
+        '''Bullet.goto(x, y=None) -> None
+        moves the bullet to (x,y)'''
+        if y == None:
+            x,y = x
+        self.x = x
+        self.y = y
+
+    def get_color(self):
+        '''Bullet.get_color() -> str
+        returns the color of the bullet'''
+        return self.color
+
+    def isvisible(self):
+        '''Bullet.isvisible() -> bool
+        returns if the bullet is showing'''
+        return self.isVisible
 
     def is_moving(self):
         '''Bullet.is_moving() -> bool
@@ -112,72 +784,159 @@ class Bullet(turtle.RawTurtle):
         returns the radius of the bullet's explosion'''
         return self.radius
 
+    def set_radius(self, radius):
+        '''Bullet.set_radius(radius) -> None
+        sets the radius of the bullet's explosion'''
+        self.radius = radius
+
+    def get_explosion(self):
+        '''Bullet.get_explosion() -> tuple
+        returns (pos, radius, color) of the explosion being shown, or None'''
+        if not self.exploding:
+            return
+        ring = int((self.master.gameTime - self.expStart)//12)
+        return self.expPos, 5 + ring*self.expSpeed, self.expColors[ring]
+
     def launch(self, pos, heading):
         '''Bullet.launch(pos, heading) -> None
         launches the bullet from pos in direction'''
         if self.master.is_over():
             return
 
-        self.isMoving = False
-        self.color(self.initColor)
         self.goto(pos)
-        self.st()
-        self.seth(heading)
+        self.isVisible = True
+        self.heading = heading
+        self.dx = round(math.cos(math.radians(heading)), 9)
+        self.dy = round(math.sin(math.radians(heading)), 9)
         self.isMoving = True
-        self.start_movement()
 
-    def start_movement(self):
-        '''Bullet.start_movement() -> None
-        starts the bullet moving'''
-        if not self.isMoving or self.master.is_over():
+    def update(self, dt):
+        '''Bullet.update(dt) -> None
+        moves the bullet for dt seconds, hitting the first thing on its way'''
+        if not self.isMoving:
             return
 
-        self.fd(10)
+        x0, y0 = self.x, self.y
+        x1 = x0 + self.speed*dt*self.dx
+        y1 = y0 + self.speed*dt*self.dy
 
-        # check if out of site
-        width = self.master.get_screen().window_width()/2
-        if self.ycor() < -width or self.ycor() > width:
-            self.explode()
-            return
+        # everything near the path, and how far along it each is hit
+        nearby = self.master.get_collisions().query_segment(x0, y0, x1, y1)
+        hit = None # (distance along the path, order, what was hit)
 
         # check for aliens
-        if self.aliens != None:
-            alienShot = self.aliens.shoot_alien(self.pos())
-            if alienShot[0]:
-                self.explode(["red",("","lime","yellow","hot pink")[alienShot[2]]],
-                    40, 5, alienShot[1])
-                return
+        if self.aliens != None and self.aliens in nearby:
+            alienHit = self.aliens.sweep(x0, y0, x1, y1)
+            if alienHit != None:
+                hit = alienHit[0], 0, alienHit[1]
 
         # check for spaceship
-        x,y = self.master.get_spaceship().pos()
-        if x - 50 <= self.xcor() <= x + 50 and \
-           y - 20 <= self.ycor() <= y + 20:
-            self.explode(["blue","blue","blue","dark grey","dark grey"], 50, 7, self.master.get_spaceship().pos())
-            self.master.get_spaceship().stop()
+        spaceship = self.master.get_spaceship()
+        if spaceship in nearby:
+            distance = spaceship.sweep(x0, y0, x1, y1)
+            if distance != None and (hit == None or distance < hit[0]):
+                hit = distance, 1, spaceship
+
+        # check for the player
+        player = self.master.get_player()
+        if self.aliens == None and player in nearby:
+            distance = player.sweep(x0, y0, x1, y1)
+            if distance != None and (hit == None or distance < hit[0]):
+                hit = distance, 2, player
+
+        # shoot at shields
+        profiler = self.master.get_profiler()
+        for shield in nearby:
+            if isinstance(shield, Shield):
+                if profiler == None:
+                    distance = shield.sweep(x0, y0, x1, y1)
+                else:
+                    distance = profiler.time_call("Shield.sweep", shield.sweep, x0, y0, x1, y1)
+                if distance != None and (hit == None or distance < hit[0]):
+                    hit = distance, 3, shield
+
+        if hit == None:
+            self.goto(x1, y1)
+            # check if out of site
+            width = self.master.get_width()/2
+            height = self.master.get_height()/2
+            if self.y < -height or self.y > height or self.x < -width or self.x > width:
+                self.explode()
+            return
+
+        distance, order, other = hit
+        self.goto(x0 + (x1-x0)*distance, y0 + (y1-y0)*distance)
+        if order == 0:
+            pos, alienType = self.aliens.destroy(other)
+            self.explode(*self.alienExplosions[alienType], pos)
+        elif order == 1:
+            self.explode(*self.spaceshipExplosion, spaceship.pos())
+            spaceship.stop()
             # add score for spaceship
             self.master.add_score(100)
-            return
+        elif order == 2:
+            self.master.hit_player(self)
+        else:
+            other.shoot_shield(self)
 
-        # shoot at shields
-        for shield in self.master.get_shields():
-            shield.shoot_shield(self)
-            
-        self.master.get_screen().update()
-        self.master.get_screen().ontimer(self.start_movement, self.wait) 
+    def get_free_steps(self, dt, targets):
+        '''Bullet.get_free_steps(dt, targets) -> int
+        returns how many of the next updates for dt seconds surely hit nothing and stay on the
+        screen, with targets a list of (obj, box) for everything that can be hit, as for Game.get_targets'''
+        if self.dx != 0 or self.dy == 0:
+            return 0
+        step = abs(self.speed*dt*self.dy)
+        height = self.master.get_height()/2
+        if self.dy > 0:
+            room = height - self.y
+        else:
+            room = self.y + height
+
+        # how far it is to whatever may be in the bullet's way, except what it cannot hit
+        if self.aliens == None:
+            skip = self.master.get_aliens()
+        else:
+            skip = self.master.get_player()
+        for obj, (left, bottom, right, top) in targets:
+            if obj is skip or self.x < left or self.x > right:
+                continue
+            if self.dy > 0 and self.y <= top:
+                room = min(room, bottom - self.y)
+            elif self.dy < 0 and self.y >= bottom:
+                room = min(room, self.y - top)
+        # stopping just short, so rounding cannot take the last step into it
+        return max(int((room - 1e-6)/step), 0)
+
+    def glide(self, numSteps, dt):
+        '''Bullet.glide(numSteps, dt) -> None
+        makes numSteps updates for dt seconds that get_free_steps found hit nothing'''
+        x, y = self.x, self.y
+        for step in range(numSteps):
+            x += self.speed*dt*self.dx
+            y += self.speed*dt*self.dy
+        self.goto(x, y)
 
     def explode(self, colors=None, size=None, speed=5, pos=None):
         '''Bullet.explode(colors=None, size=None, pos=None) -> None
         hides the bullet and stops its movement'''
-        self.ht()
+        self.isVisible = False
         self.isMoving = False
 
         # explode
         if colors != None:
+            # the color of every ring, one every 12 ms growing by speed up to size,
+            # is picked now and each is shown as its time comes
+            rings = []
+            radius = 5
+            while radius <= size:
+                rings.append(self.master.get_random().choice(colors))
+                radius += speed
+            if len(rings) == 0:
+                return
             self.exploding = True
-            self.expSize = 5
-            self.expColors = colors
+            self.expColors = rings
             self.expSpeed = speed
-            self.expMax = size
+            self.expStart = self.master.gameTime
 
             # get pos
             if pos == None:
@@ -185,185 +944,476 @@ class Bullet(turtle.RawTurtle):
             else:
                 self.expPos = pos
 
-            self.explosion()
+            self.numExplosions += 1
+            self.master.schedule(self.explosion, 12*len(rings), self.numExplosions)
 
-    def explosion(self):
-        '''Bullet.explosion() -> None
-        creates an explosion'''
-        # add to dict            
-        if self.expSize > self.expMax:
-            self.clear()
+    def explosion(self, numExplosions):
+        '''Bullet.explosion(numExplosions) -> None
+        ends the explosion after its last ring
+        numExplosions is how many explosions there were when this was scheduled'''
+        if numExplosions == self.numExplosions:
             self.exploding = False
-            return
 
-        # get into position
-        self.color(random.choice(self.expColors))
-        self.clear()
-        self.goto(self.expPos)
-        self.fd(self.expSize)
-        self.left(90)
+class BulletPool:
+    '''a fixed number of bullets that are used again instead of made again'''
+
+    __slots__ = ("bullets", "numActive")
 
-        # draw explosion
-        self.pd()
-        self.circle(self.expSize)
-        self.pu()
-        self.right(90)
-        self.expSize += self.expSpeed
+    def __init__(self, master, capacity, color, aliens=None, numActive=None, speed=1000/3):
+        '''BulletPool(master, capacity, color, aliens=None, numActive=None, speed=1000/3) -> BulletPool
+        makes capacity bullets flying speed world units per second,
+        the first numActive of which can be shot (all by default)'''
+        self.bullets = [Bullet(master, color, aliens, speed=speed) for i in range(capacity)]
+        if numActive == None:
+            numActive = capacity
+        self.numActive = numActive
+
+    def __len__(self):
+        '''len(BulletPool) -> int
+        returns the number of bullets that can be shot'''
+        return self.numActive
+
+    def __iter__(self):
+        '''iter(BulletPool) -> iterator
+        goes through the bullets that can be shot'''
+        return iter(self.bullets[:self.numActive])
+
+    def get_bullets(self):
+        '''BulletPool.get_bullets() -> list
+        returns every bullet in the pool, even the ones that can't be shot'''
+        return self.bullets
+
+    def get_capacity(self):
+        '''BulletPool.get_capacity() -> int
+        returns the number of bullets in the pool'''
+        return len(self.bullets)
+
+    def set_active(self, numActive):
+        '''BulletPool.set_active(numActive) -> None
+        lets the first numActive bullets be shot, up to the capacity'''
+        self.numActive = min(max(numActive, 0), len(self.bullets))
+
+    def reset(self):
+        '''BulletPool.reset() -> None
+        stops every bullet'''
+        for bullet in self.bullets:
+            bullet.reset()
 
-        self.master.get_screen().update()
-        self.master.get_screen().ontimer(self.explosion, 12)  
-        
 class Shield:
     '''represents the shield'''
 
-    def __init__(self, master, x, y, width, height, color):
-        '''Shield(master, x,y,width,height) -> Shield
-        constructs a shield with dimestion width x height and postion (x,y)'''
-        master.get_canvas().create_rectangle(x-width/2, -y-height/2, x+width/2, -y+height/2, fill=color)
-        self.holes = []
+    stencils = {} # (radius, cellSize) -> list of (row offset, half width) of a circle of cells
 
+    def __init__(self, master, x, y, width, height, color, cellSize=2):
+        '''Shield(master, x,y,width,height,color,cellSize=2) -> Shield
+        constructs a shield with dimestion width x height and postion (x,y)
+        the shield is a bitmap of cellSize x cellSize cells, 1 where it is solid'''
         # store postion date
         self.x = x
         self.y = y
         self.width = width
         self.height = height
+        self.color = color
         self.master = master
+        master.get_collisions().insert(self, *self.get_box())
+
+        # bitmap: row 0 is the top of the shield
+        self.cellSize = cellSize
+        self.numColumns = math.ceil(width/cellSize)
+        self.numRows = math.ceil(height/cellSize)
+        self.numResets = 0
+        self.totalHits = 0
+        self.reset()
+
+    def get_box(self):
+        '''Shield.get_box() -> tuple
+        returns the left, bottom, right and top of the box bullets are checked against'''
+        return self.x-self.width/2-3, self.y-self.height/2-3, self.x+self.width/2+3, self.y+self.height/2+3
+
+    def get_cells(self):
+        '''Shield.get_cells() -> bytearray
+        returns the bitmap of the shield, row by row from the top'''
+        return self.cells
+
+    def get_changes(self):
+        '''Shield.get_changes() -> list
+        returns (row, first column, last column) of every strip carved since the last reset'''
+        return self.changes
+
+    def get_num_resets(self):
+        '''Shield.get_num_resets() -> int
+        returns how many times the shield has been filled back in'''
+        return self.numResets
+
+    def get_num_hits(self):
+        '''Shield.get_num_hits() -> int
+        returns how many holes have been made since the last reset'''
+        return self.numHits
 
-    def get_holes(self):
-        '''Shield.get_holes() -> list
-        returns a list of all holes'''
-        return self.holes
+    def get_total_hits(self):
+        '''Shield.get_total_hits() -> int
+        returns how many holes have been made in the whole game'''
+        return self.totalHits
+
+    def reset(self):
+        '''Shield.reset() -> None
+        fills in all the holes'''
+        self.cells = bytearray([1])*(self.numColumns*self.numRows)
+        self.changes = []
+        self.numHits = 0
+        self.numResets += 1
+
+    def get_stencil(self, radius):
+        '''Shield.get_stencil(radius) -> list
+        returns the (row offset, half width) of each row in a circle of cells'''
+        key = radius, self.cellSize
+        if key not in self.stencils:
+            cells = int(radius//self.cellSize)
+            self.stencils[key] = [(row, int((cells**2 - row**2)**(1/2))) for row in range(-cells, cells+1)]
+        return self.stencils[key]
+
+    def is_solid(self, x, y, radius):
+        '''Shield.is_solid(x, y, radius) -> bool
+        returns if any of the shield is within radius of (x,y)'''
+        column = int((x - self.x + self.width/2)//self.cellSize)
+        row = int((self.y + self.height/2 - y)//self.cellSize)
+
+        for rowOffset, half in self.get_stencil(radius):
+            if 0 <= row+rowOffset < self.numRows:
+                start = (row+rowOffset)*self.numColumns
+                first = start + max(column-half, 0)
+                last = start + min(column+half, self.numColumns-1)
+                if first <= last and self.cells.find(1, first, last+1) != -1:
+                    return True
+        return False
+
+    def carve(self, x, y, radius):
+        '''Shield.carve(x, y, radius) -> None
+        makes a hole of radius centered at (x,y)'''
+        column = int((x - self.x + self.width/2)//self.cellSize)
+        row = int((self.y + self.height/2 - y)//self.cellSize)
+
+        for rowOffset, half in self.get_stencil(radius):
+            if 0 <= row+rowOffset < self.numRows:
+                first = max(column-half, 0)
+                last = min(column+half, self.numColumns-1)
+                if first <= last:
+                    start = (row+rowOffset)*self.numColumns
+                    self.cells[start+first:start+last+1] = bytes(last-first+1)
+                    self.changes.append((row+rowOffset, first, last))
+        self.numHits += 1
+        self.totalHits += 1
+
+    def sweep(self, x0, y0, x1, y1):
+        '''Shield.sweep(x0, y0, x1, y1) -> float
+        returns how far along the segment from (x0,y0) to (x1,y1), from 0 to 1,
+        a bullet first hits the shield, or None if it goes through holes or misses'''
+        box = self.get_box()
+        enter = sweep_box(x0, y0, x1, y1, *box)
+        if enter == None:
+            return None
+        leave = 1 - sweep_box(x1, y1, x0, y0, *box)
+
+        # march through the shield half a cell at a time, a bullet is in a hole
+        # while nothing solid is within 4 units
+        length = math.hypot(x1-x0, y1-y0)
+        step = self.cellSize/2/length if length != 0 else 1
+        distance = enter
+        while True:
+            if self.is_solid(x0 + (x1-x0)*distance, y0 + (y1-y0)*distance, 4):
+                return distance
+            if distance >= leave:
+                return None
+            distance = min(distance+step, leave)
 
     def shoot_shield(self, bullet):
         '''Shield.shoot_shield(bullet) -> None
-        checks if bullet has shot shield'''
-        # get bullet position
+        makes the hole of bullet where it hit the shield'''
         x,y = bullet.pos()
-
-        # check if inside shield
-        if not (self.x - self.width/2 - 3 <= x <= self.x + self.width/2 + 3 and \
-                self.y - self.height/2 - 3 <= y <= self.y + self.height/2 + 3):
-            return
-
-        # check if inside hole
-        for hole in self.holes:
-            # get distance from center of hole
-            distance = ((hole[0] - x)**2 + (hole[1] - y)**2)**(1/2)
-            # check if in hole
-            if distance < hole[2]-4:
-                return
-        
-        # draw hole
-        radius = bullet.get_radius()
-        num = self.master.get_canvas().create_oval(x-radius, -y-radius, x+radius, -y+radius, fill="black")
-        self.holes.append((x, y, radius, num))
+        self.carve(x, y, bullet.get_radius())
         bullet.explode()
 
-class Spaceship(turtle.RawTurtle):
+class Spaceship:
     '''represents the alien spaceship'''
 
     def __init__(self, master):
         '''Spaceship(master) -> Spaceship
         constructs the spaceship'''
-        turtle.RawTurtle.__init__(self, master.get_screen())
-
-        # info and data
-        self.waitPeriod = random.randint(5,30)
-        self.last = time.time()
-        self.pu()
-        self.shape("spaceship.gif")
-        self.height = master.get_screen().window_height()/2 - 25
-        self.width = master.get_screen().window_width()/2+100
-        self.goto(self.width, self.height)
-        self.direction = -1
+        self.height = master.get_height()/2 - 25
+        self.width = master.get_width()/2+100
         self.speed = 3
         self.master = master
+        self.mask = master.get_assets().get_mask("spaceship")
+        self.numResets = 0
+        self.reset()
+
+    def reset(self):
+        '''Spaceship.reset() -> None
+        puts the spaceship back to waiting off screen and starts it'''
+        self.waitPeriod = self.master.get_random().randint(5,30)
+        self.last = self.master.get_time()
+        self.x = self.width
+        self.y = self.height
+        self.direction = -1
         self.isMoving = False
+        self.isVisible = False
+        self.numPlain = 0
+        self.nextMove = 0
+        self.master.get_collisions().remove(self)
 
-        self.start_movement()
+        # a wake-up still waiting from before the reset is dropped
+        self.numResets += 1
+        self.start_movement(self.numResets)
 
-    def start_movement(self):
-        '''Spaceship.start_movement() -> None
-        starts the movement of the spaceship'''
-        if self.master.is_over():
+    def pos(self):
+        '''Spaceship.pos() -> tuple
+        returns the position of the spaceship'''
+        return self.x, self.y
+
+    def xcor(self):
+        '''Spaceship.xcor() -> float
+        returns the x coordinate of the spaceship'''
+        return self.x
+
+    def get_box(self):
+        '''Spaceship.get_box() -> tuple
+        returns the left, bottom, right and top of the spaceship's hitbox'''
+        left, bottom, right, top = self.mask.get_bounds()
+        return self.x+left, self.y+bottom, self.x+right, self.y+top
+
+    def sweep(self, x0, y0, x1, y1):
+        '''Spaceship.sweep(x0, y0, x1, y1) -> float
+        returns how far along the segment from (x0,y0) to (x1,y1), from 0 to 1,
+        it first hits the spaceship, or None if it misses'''
+        return self.mask.sweep(x0-self.x, y0-self.y, x1-self.x, y1-self.y)
+
+    def isvisible(self):
+        '''Spaceship.isvisible() -> bool
+        returns if the spaceship is showing'''
+        return self.isVisible
+
+    def is_moving(self):
+        '''Spaceship.is_moving() -> bool
+        returns if the spaceship is going across the screen'''
+        return self.isMoving
+
+    def start_movement(self, numResets):
+        '''Spaceship.start_movement(numResets) -> None
+        moves the spaceship every 5 ms, or starts it once its wait is over
+        numResets is how many resets there were when this was scheduled'''
+        if self.master.is_over() or numResets != self.numResets:
             return
+        self.catch_up()
 
         # move
         if self.isMoving:
-            self.fd(self.direction*self.speed)
+            self.x += self.direction*self.speed
 
             # check if out of screen
-            if self.xcor() <= -self.width or self.xcor() >= self.width:
+            if self.x <= -self.width or self.x >= self.width:
                 self.stop()
-                
-        elif time.time() - self.last > self.waitPeriod:
+            else:
+                self.master.get_collisions().insert(self, *self.get_box())
+
+        elif self.master.get_time() - self.last > self.waitPeriod:
             self.isMoving = True
-            self.fd(self.direction)
-            self.st()
+            self.x += self.direction
+            self.isVisible = True
+
+        else:
+            # sleep until the first of the 5 ms steps past the wait, instead of checking every step
+            now = self.master.gameTime
+            steps = max(int(((self.last + self.waitPeriod)*1000 - now)//5) - 1, 1)
+            while (now + 5*steps)/1000 - self.last <= self.waitPeriod:
+                steps += 1
+            self.master.schedule(self.start_movement, 5*steps, numResets)
+            return
+
+        if self.isMoving:
+            self.plan()
+        else:
+            self.master.schedule(self.start_movement, 5, numResets)
+
+    def plan(self):
+        '''Spaceship.plan() -> None
+        works out how many of the next 5 ms moves stay on the screen, which catch_up
+        makes when they are due, and schedules start_movement for the one after them'''
+        x = self.x
+        numPlain = 0
+        while True:
+            x += self.direction*self.speed
+            if x <= -self.width or x >= self.width:
+                break
+            numPlain += 1
 
-        self.master.get_screen().update()
-        self.master.get_screen().ontimer(self.start_movement, 5)
+        self.nextMove = self.master.gameTime + 5
+        self.numPlain = numPlain
+        self.master.schedule(self.start_movement, 5*(numPlain+1), self.numResets)
+
+    def get_drift(self):
+        '''Spaceship.get_drift() -> tuple
+        returns how far (left, right) the moves left to catch_up take the spaceship'''
+        distance = self.numPlain*self.speed
+        if self.direction < 0:
+            return distance, 0
+        return 0, distance
+
+    def catch_up(self):
+        '''Spaceship.catch_up() -> None
+        makes the moves across the screen that are due'''
+        if self.numPlain == 0 or self.nextMove > self.master.gameTime:
+            return
+        if self.master.is_over():
+            self.numPlain = 0
+            return
+
+        while self.numPlain != 0 and self.nextMove <= self.master.gameTime:
+            self.x += self.direction*self.speed
+            self.nextMove += 5
+            self.numPlain -= 1
+        self.master.get_collisions().insert(self, *self.get_box())
 
     def stop(self):
         '''Spaceship.stop() -> None
         stops the spaceship'''
         self.isMoving = False
-        self.ht()
-        self.direction = random.choice([1,-1])
-        self.goto(self.direction*self.width,self.height)
+        self.isVisible = False
+        self.numPlain = 0
+        self.master.get_collisions().remove(self)
+        self.direction = self.master.get_random().choice([1,-1])
+        self.x = self.direction*self.width
+        self.y = self.height
         self.direction = -self.direction
-        self.waitPeriod = random.randint(5, 30)
-        self.last = time.time()     
+        self.waitPeriod = self.master.get_random().randint(5, 30)
+        self.last = self.master.get_time()
 
-class Aliens(turtle.RawTurtle):
+class Aliens:
     '''all of the aliens'''
 
-    def __init__(self, master, startPos, frameWait, speed, moveWait, numDown=6):
-        '''Aliens(master, startPos, frameWait, speed, moveWait, numDown) -> Aliens
-        the object for all the aliens'''
-        # set up turtle
-        turtle.RawTurtle.__init__(self, master.get_screen())
-        self.pu()
-        self.ht()
-
-        # add aliens
-        self.aliens = []
-        distance = 55
-        for y in range(6):
-            self.aliens.extend([((-110,y*distance),1),((-185,y*distance),1),((-35,y*distance),2),
-                ((35,y*distance),2),((110,y*distance),3),((185,y*distance),3)])
-
-        self.startPos = startPos
-        self.currentPos = startPos
-        self.frameWait = frameWait
+    def __init__(self, master, levels, numRows=None, numBullets=None):
+        '''Aliens(master, levels, numRows=None, numBullets=None) -> Aliens
+        the object for all the aliens, laid out and sped up by the LevelConfig levels
+        numRows and numBullets change the number of rows and bullets at level 1 from levels,
+        which by default has as many rows as fit in the field'''
+        self.levels = levels
+        if numRows == None:
+            numRows = min(levels.numRows, levels.get_row_room(master.get_height()))
+        if numBullets == None:
+            numBullets = levels.get_level(1).alienBullets
+        self.extraBullets = numBullets - levels.get_level(1).alienBullets
+        self.numRows = numRows
+
+        # add aliens as a grid: cell row*numColumns+column is alive if alive[cell] is 1
+        distance = levels.rowSpacing
+        layout = levels.get_columns(master.get_width())
+        self.columns = [column[0] for column in layout]
+        self.types = [column[1] for column in layout]
+        self.rows = [y*distance for y in range(numRows)]
+        self.numColumns = len(self.columns)
+        self.alive = bytearray(numRows*self.numColumns)
+
+        # hitmask of each (type, frame), the box around them all for the rough
+        # checks, and how far the outer aliens go before the formation turns around
+        assets = master.get_assets()
+        self.masks = {key: assets.get_mask(key) for key in assets.files if isinstance(key, tuple)}
+        bounds = [mask.get_bounds() for mask in self.masks.values() if mask.get_bounds() != None]
+        self.hitWidth = max(max(-bound[0], bound[2]) for bound in bounds)
+        self.hitHeight = max(max(-bound[1], bound[3]) for bound in bounds)
+        self.bound = master.get_width()/2 - levels.sideGap
+
+        # the top row starts levels.top below the top of the field
+        self.startPos = levels.startX, master.get_height()/2 - levels.top - (numRows-1)*distance
+        self.frameWait = levels.frameWait
         self.master = master
-        self.moveSpeed = speed
+        self.numPlans = 0
+        self.maxPlain = 1000 # most plain moves planned at once
+
+        # set up bullets, with room for the most of any level, the ones
+        # past those of level 1 are big
+        self.bullets = BulletPool(master, max(levels.maxAlienBullets+self.extraBullets, numBullets), "red", None,
+            numBullets, levels.alienBulletSpeed)
+        for bullet in self.bullets.get_bullets()[numBullets:]:
+            bullet.set_radius(20)
+
+        self.reset()
+        self.update_level(1)
+
+    def reset(self):
+        '''Aliens.reset() -> None
+        brings back every alien at the start position and stops the bullets'''
+        self.alive[:] = bytes([1])*len(self.alive)
+        self.numAlive = len(self.alive)
+        self.destroyed = [] # cells shot since the last call to take_destroyed
+
+        # index of the alive aliens, kept up to date by remove_alien
+        self.columnCounts = [self.numRows]*self.numColumns
+        self.rowCounts = [self.numColumns]*self.numRows
+        self.aliveColumns = list(range(self.numColumns)) # columns with an alien, in no order
+        self.columnSlots = list(range(self.numColumns)) # index of each column in aliveColumns
+        self.bottoms = [0]*self.numColumns # lowest alive row of each column
+        self.left = 0 # outer alive columns and rows
+        self.right = self.numColumns-1
+        self.bottom = 0
+        self.top = self.numRows-1
+
         self.direction = -1
-        self.moveWait = moveWait
-        self.numDown = numDown
         self.currentDown = 0
 
-        # set up bullets
-        self.bullets = [Bullet(master, "red", None) for i in range(2)]
-        self.cooldown = 1
-        self.last = 0
-        
-        self.move(startPos)
+        # plain moves still to make, from game time nextMove on, and if the plan
+        # waits for a bullet to come free; a new plan drops the old one
+        self.numPlain = 0
+        self.nextMove = 0
+        self.waiting = False
+        self.numPlans += 1
+
+        self.bullets.reset()
+        self.last = -self.levels.get_level(1).alienCooldown
+
+        self.move(self.startPos)
 
     def __len__(self):
         '''len(Aliens) -> int
         returns the number of remaining aliens'''
-        return len(self.aliens)
+        return self.numAlive
+
+    def get_aliens(self):
+        '''Aliens.get_aliens() -> list
+        returns a list of all remaining aliens as ((x, y), type)
+        relative to the current position'''
+        return [self.get_alien(cell) for cell in range(len(self.alive)) if self.alive[cell]]
+
+    def get_cells(self):
+        '''Aliens.get_cells() -> list
+        returns a list of the cells of all remaining aliens'''
+        return [cell for cell in range(len(self.alive)) if self.alive[cell]]
+
+    def take_destroyed(self):
+        '''Aliens.take_destroyed() -> list
+        returns the cells of the aliens shot since the last call'''
+        destroyed = self.destroyed
+        self.destroyed = []
+        return destroyed
+
+    def get_alien(self, cell):
+        '''Aliens.get_alien(cell) -> tuple
+        returns ((x, y), type) of the alien in cell, relative to the current position'''
+        row, column = divmod(cell, self.numColumns)
+        return (self.columns[column], self.rows[row]), self.types[column]
+
+    def get_pos(self):
+        '''Aliens.get_pos() -> tuple
+        returns the current position of the aliens'''
+        return self.currentPos
 
     def get_frame(self):
-        '''Aliens.get_frame() -> str
+        '''Aliens.get_frame() -> int
         returns the current frame (1 or 2)'''
-        return str(int((self.currentPos[0]//self.frameWait) % 2 + 1))
+        return int(self.currentPos[0]//self.frameWait) % 2 + 1
 
     def get_bullets(self):
         '''Aliens.get_bullets() -> list
         returns a list of all bullets'''
-        return self.bullets
+        return self.bullets.get_bullets()
 
     def get_lowest_ycor(self):
         '''Aliens.get_lowest_ycor() -> int
@@ -371,86 +1421,173 @@ class Aliens(turtle.RawTurtle):
         if len(self) == 0:
             return
 
-        lowest = self.aliens[0][0]
-        for alien in self.aliens:
-            if alien[0][1] < lowest[1]:
-                lowest = alien[0]
+        # first alive alien of the bottom row
+        lowest = self.get_alien(self.alive.index(1, self.bottom*self.numColumns))[0]
         return lowest[0] + self.currentPos[0], lowest[1] + self.currentPos[1]
 
-    def update_level(self ,level):
+    def get_extents(self):
+        '''Aliens.get_extents() -> tuple
+        returns the x of the left and right alive columns and the y of the
+        bottom and top alive rows, relative to the current position'''
+        return self.columns[self.left], self.columns[self.right], self.rows[self.bottom], self.rows[self.top]
+
+    def get_bottom_cell(self, column):
+        '''Aliens.get_bottom_cell(column) -> int
+        returns the cell of the lowest alive alien in column, or None if it is empty'''
+        if self.columnCounts[column] == 0:
+            return None
+        return self.bottoms[column]*self.numColumns + column
+
+    def remove_alien(self, cell):
+        '''Aliens.remove_alien(cell) -> None
+        takes the alien in cell out of the formation and its index'''
+        self.alive[cell] = 0
+        self.numAlive -= 1
+        row, column = divmod(cell, self.numColumns)
+        self.columnCounts[column] -= 1
+        self.rowCounts[row] -= 1
+        if len(self) == 0:
+            self.master.request_checkup()
+        if self.columnCounts[column] == 0:
+            # swap the last alive column into its place
+            last = self.aliveColumns.pop()
+            if last != column:
+                self.aliveColumns[self.columnSlots[column]] = last
+                self.columnSlots[last] = self.columnSlots[column]
+        if len(self) == 0:
+            return
+
+        # every pointer only moves inwards, so they move at most once per row or column per level
+        while self.bottoms[column] < self.numRows and not self.alive[self.bottoms[column]*self.numColumns+column]:
+            self.bottoms[column] += 1
+        while self.columnCounts[self.left] == 0:
+            self.left += 1
+        while self.columnCounts[self.right] == 0:
+            self.right -= 1
+        while self.rowCounts[self.bottom] == 0:
+            self.bottom += 1
+        while self.rowCounts[self.top] == 0:
+            self.top -= 1
+
+    def update_level(self, level):
         '''Aliens.update_level(level) -> None
         updates the aliens for level'''
-        if self.moveWait > 5:
-            self.moveWait -= 1
-            self.moveSpeed += 1/15
-        if level >= 7:
-            self.bullets.append(Bullet(self.master, "red", None, 20))
-            self.cooldown -= 0.9
-        if 5 < level <= 10:
-            self.numDown += 1
+        numbers = self.levels.get_level(level)
+        self.moveWait = numbers.moveWait
+        self.moveSpeed = numbers.moveSpeed
+        self.numDown = numbers.numDown
+        self.cooldown = numbers.alienCooldown
+        self.bullets.set_active(max(numbers.alienBullets+self.extraBullets, 0))
 
     def move(self, x, y=None):
         '''Aliens.move(x, y=None) -> None
         moves aliens to pos'''
-        self.clear()
-
         # position
         if y == None:
             x,y = x
         self.currentPos = x,y
-            
-        # draw all aliens
-        for alien in self.aliens:
-            self.goto(alien[0][0]+x, alien[0][1]+y) 
-            self.shape("alien_"+str(alien[1])+"_frame_"+self.get_frame()+".gif")
-            self.stamp()
-
-    def shoot_alien(self, pos):
-        '''Aliens.shoot_alien(x, y) -> bool
-        checks if (x,y) shoots an alien. If it does, returns True and the alien is removed.
-        Otherwise returns False'''
-        isHit = self.is_hit(pos) # get if hit
-        # if alien is hit
-        if isHit[0]:
-            self.aliens.remove(isHit[1])
-            # add score for alien
-            self.master.add_score(10)
-
-        # return
-        if isHit[1] == None:
-            return isHit
-        else:
-            return isHit[0], (isHit[1][0][0]+self.currentPos[0], isHit[1][0][1]+self.currentPos[1]), isHit[1][1]
+        self.update_collisions()
+
+    def update_collisions(self):
+        '''Aliens.update_collisions() -> None
+        moves the formation's box in the collision grid'''
+        if len(self) == 0:
+            self.box = None
+            self.master.get_collisions().remove(self)
+            return
+
+        x,y = self.currentPos
+        left, right, bottom, top = self.get_extents()
+        self.box = x+left-self.hitWidth, y+bottom-self.hitHeight, x+right+self.hitWidth, y+top+self.hitHeight
+        self.master.get_collisions().insert(self, *self.box)
+
+    def get_box(self):
+        '''Aliens.get_box() -> tuple
+        returns the left, bottom, right and top of the box around every alive alien, or None'''
+        return self.box
+
+    def destroy(self, cell):
+        '''Aliens.destroy(cell) -> tuple, int
+        removes the alien in cell, adds the score for it and returns its position and type'''
+        self.remove_alien(cell)
+        self.destroyed.append(cell)
+        self.master.add_score(10)
+        self.update_collisions()
+
+        alien = self.get_alien(cell)
+        return (alien[0][0]+self.currentPos[0], alien[0][1]+self.currentPos[1]), alien[1]
+
+    def sweep(self, x0, y0, x1, y1):
+        '''Aliens.sweep(x0, y0, x1, y1) -> float, int
+        returns how far along the segment from (x0,y0) to (x1,y1), from 0 to 1,
+        it first hits an alien and the cell of that alien, or None if it misses them all'''
+        # segment relative to the formation
+        x0 -= self.currentPos[0]
+        x1 -= self.currentPos[0]
+        y0 -= self.currentPos[1]
+        y1 -= self.currentPos[1]
+
+        # only the columns and rows whose hitboxes the segment can touch
+        columns = range(bisect.bisect_left(self.columns, min(x0, x1)-self.hitWidth),
+            bisect.bisect_right(self.columns, max(x0, x1)+self.hitWidth))
+        rows = range(bisect.bisect_left(self.rows, min(y0, y1)-self.hitHeight),
+            bisect.bisect_right(self.rows, max(y0, y1)+self.hitHeight))
+
+        hit = None
+        frame = self.get_frame()
+        for row in rows:
+            y = self.rows[row]
+            for column in columns:
+                cell = row*self.numColumns + column
+                if self.alive[cell]:
+                    x = self.columns[column]
+                    distance = self.masks[self.types[column], frame].sweep(x0-x, y0-y, x1-x, y1-y)
+                    if distance != None and (hit == None or distance < hit[0]):
+                        hit = distance, cell
+        return hit
 
     def is_hit(self, pos):
         '''Aliens.is_hit(pos) -> bool, obj
-        returns (True, alien) if hit. Otherwise returns (False, None)'''
-        x,y = pos # unpack
-
-        # loop though aliens
-        for alien in self.aliens:            
-            # if alien is hit
-            if self.currentPos[0]+alien[0][0]-30.5 <= x <= self.currentPos[0]+alien[0][0]+30.5 and\
-               self.currentPos[1]+alien[0][1]-24 <= y <= self.currentPos[1]+alien[0][1]+24:
-                return True, alien
+        returns (True, cell) if an alien is hit. Otherwise returns (False, None)'''
+        # position relative to the formation
+        x = pos[0] - self.currentPos[0]
+        y = pos[1] - self.currentPos[1]
+
+        # only the columns and rows whose hitboxes hold the position
+        columns = range(bisect.bisect_left(self.columns, x-self.hitWidth),
+            bisect.bisect_right(self.columns, x+self.hitWidth))
+        rows = range(bisect.bisect_left(self.rows, y-self.hitHeight),
+            bisect.bisect_right(self.rows, y+self.hitHeight))
+
+        frame = self.get_frame()
+        for row in rows:
+            for column in columns:
+                cell = row*self.numColumns + column
+                if self.alive[cell] and self.masks[self.types[column], frame].is_solid(x-self.columns[column],
+                        y-self.rows[row]):
+                    return True, cell
         return False, None
 
-    def start_movement(self):
-        '''Aliens.start_movement() -> None
-        starts the aliens moving'''
+    def start_movement(self, numPlans):
+        '''Aliens.start_movement(numPlans) -> None
+        makes a move that may turn, go down or shoot, then plans the next ones
+        numPlans is how many plans there were when this was scheduled'''
+        if numPlans != self.numPlans:
+            return
+        self.catch_up()
+
         # check for next level
         if len(self) == 0:
-            self.move(self.currentPos)
             return
-        
+
         # check if game is over
         if self.master.is_over():
-            self.move(self.currentPos)
             self.master.end_game()
             return
 
-        width = self.master.get_screen().window_width()/2 # width of half the screen
-        if (self.currentPos[0] < -width+230 or self.currentPos[0] > width-230) and self.currentDown >= 0:
+        x = self.currentPos[0]
+        left, right = self.get_extents()[:2]
+        if (x+left < -self.bound or x+right > self.bound) and self.currentDown >= 0:
             # go for player
             if self.get_lowest_ycor()[1] - self.master.get_player().ycor() <= 20 and len(self) != 0:
                 self.direction = -self.direction
@@ -462,7 +1599,7 @@ class Aliens(turtle.RawTurtle):
                     self.direction = 1
                 else:
                     self.direction = -1
-                    
+
             # move down
             elif self.currentDown != self.numDown:
                 self.move(self.currentPos[0],self.currentPos[1]-5)
@@ -475,23 +1612,93 @@ class Aliens(turtle.RawTurtle):
         else:
             self.move(self.currentPos[0]+self.moveSpeed*self.direction,
                 self.currentPos[1])
+        if self.master.is_player_reached():
+            self.master.request_checkup()
         # shoot bullet
         if len(self) != 0:
             self.shoot()
 
-        self.master.get_screen().update()
-        self.master.screen.ontimer(self.start_movement, self.moveWait)
+        self.plan(self.master.gameTime + self.moveWait)
+
+    def plan(self, nextMove):
+        '''Aliens.plan(nextMove) -> None
+        works out how many moves from nextMove (in milliseconds of game time) on are
+        plain steps to the side that cannot turn or shoot, which catch_up makes when
+        they are due, and schedules start_movement for the first move that is not'''
+        waiting = all(bullet.is_moving() for bullet in self.bullets)
+        x = self.currentPos[0]
+        left, right = self.get_extents()[:2]
+        step = self.moveSpeed*self.direction
+        moveTime = nextMove
+        numPlain = 0
+        # once they are as low as the player, a step that may reach wherever
+        # the player can have got to by then is not plain either
+        player = self.master.get_player()
+        px, py = player.xcor(), player.ycor()+15
+        box = self.box
+        isLow = box != None and box[1] <= py <= box[3]
+        while numPlain < self.maxPlain:
+            if (x+left < -self.bound or x+right > self.bound) and self.currentDown >= 0:
+                break
+            if not waiting and moveTime/1000 - self.last >= self.cooldown:
+                break
+            if isLow:
+                shift = x + step - self.currentPos[0]
+                # the player moves at the start of every tick before then
+                tickTime = self.master.tickTime
+                reach = player.get_speed()*(math.ceil((moveTime - self.master.gameTime)/tickTime) + 1)*tickTime/1000
+                if box[0]+shift-reach <= px <= box[2]+shift+reach:
+                    break
+            x += step
+            moveTime += self.moveWait
+            numPlain += 1
+
+        self.nextMove = nextMove
+        self.numPlain = numPlain
+        self.waiting = waiting
+        self.numPlans += 1
+        self.master.schedule(self.start_movement, moveTime - self.master.gameTime, self.numPlans)
+
+    def get_drift(self):
+        '''Aliens.get_drift() -> tuple
+        returns how far (left, right) the moves left to catch_up take the aliens'''
+        distance = self.numPlain*self.moveSpeed
+        if self.direction < 0:
+            return distance, 0
+        return 0, distance
+
+    def catch_up(self):
+        '''Aliens.catch_up() -> None
+        makes the plain moves that are due, and plans again if a shot was
+        waiting for a bullet and one is free'''
+        if self.numPlain != 0:
+            if len(self) == 0 or self.master.is_over():
+                self.numPlain = 0
+            elif self.nextMove <= self.master.gameTime:
+                x = self.currentPos[0]
+                step = self.moveSpeed*self.direction
+                while self.numPlain != 0 and self.nextMove <= self.master.gameTime:
+                    x += step
+                    self.nextMove += self.moveWait
+                    self.numPlain -= 1
+                self.move(x, self.currentPos[1])
+
+        if self.waiting and len(self) != 0 and not self.master.is_over():
+            if not all(bullet.is_moving() for bullet in self.bullets):
+                self.plan(self.nextMove)
 
     def shoot(self):
         '''Aliens.shoot() -> None
         shoots one of the alien bullets'''
-        if time.time() - self.last < self.cooldown:
+        if self.master.get_time() - self.last < self.cooldown:
             return
 
         for bullet in self.bullets:
             if not bullet.is_moving():
-                self.last = time.time()
-                randomAlien = random.choice(self.aliens)[0]
+                self.last = self.master.get_time()
+                # the lowest alien of a random column, the others are behind it
+                column = self.aliveColumns[self.master.get_random().randrange(len(self.aliveColumns))]
+                randomAlien = self.get_alien(self.get_bottom_cell(column))[0]
                 bullet.launch((randomAlien[0]+self.currentPos[0],
                     randomAlien[1]+self.currentPos[1]), 270)
                 return
@@ -499,201 +1706,2094 @@ class Aliens(turtle.RawTurtle):
     def restart(self, level):
         '''Aliens.restart(level) -> None
         restarts the aliens'''
-        self.__init__(self.master, self.startPos, self.frameWait, self.moveSpeed, self.moveWait, self.numDown)
+        self.reset()
         self.update_level(level)
-        self.start_movement()
-        
-class SpaceInvadersFrame(Frame):
-    '''the frame for space invaders'''
+        self.start_movement(self.numPlans)
 
-    def __init__(self, master, numLives=5):
-        '''SpaceInvadersFrame(master, numLives=5) -> SpaceInvadersFrame
-        sets up the frame and game data'''
-        # enter game
-        self.waiting = StringVar(value="waiting")
-        self.master = master
-        self.name_input()
-        master.geometry("1000x700+100+50")
-        
-        Frame.__init__(self, master)
-        self.grid()
-        
-        # canvas and screen
-        self.canvas = Canvas(self, width=1000, height=700)
-        self.canvas.grid(row=0, column=0)
-        self.screen = turtle.TurtleScreen(self.canvas)
-        self.screen.tracer(0)
-        self.screen.bgcolor("black")
-        self.isOver = False
+class Controls:
+    '''the keys held down, changed only between ticks'''
 
-        # game data
-        self.lives = numLives
-        self.level = 1
-        self.score = 0
-        self.highScore = self.get_high_score()
-        self.scoreLabel = self.canvas.create_text(0,self.screen.window_height()/2-30,
-            text=str(self).format(numLives,1,0, self.highScore),font=("Arial",17),fill="white")
-        
-        # import all gif shapes using screen.register_shape
-        for alienNum in range(1,4):
-            for frame in range(1,3):
-                self.screen.register_shape("alien_"+str(alienNum)+"_frame_"+str(frame)+".gif")
-        self.screen.register_shape("player.gif")
-        self.screen.register_shape("spaceship.gif")
-        self.screen.register_shape("broken_player.gif")
-
-        # explosion dict
-        self.expDic = {}
+    keys = ("shoot", "left", "right")
+    # the inputs that change the keys, in replay order
+    inputs = ("shoot down", "shoot up", "left down", "left up", "right down", "right up")
 
-        # game components
-        self.shields = [Shield(self, x, -200, 100, 60, "brown") for x in range(-300,301,300)]
-        self.spaceship = Spaceship(self)
-        self.aliens = Aliens(self, (105,-20), 10, 1, 10)
-        self.aliens.start_movement()
-        self.player = Player(self, 3, 1)
-        self.screen.update()
+    def __init__(self):
+        '''Controls() -> Controls
+        controls with no keys held down'''
+        self.held = dict.fromkeys(self.keys, False)
+        self.queue = []
 
-        self.game_checkup()
+    def is_held(self, key):
+        '''Controls.is_held(key) -> bool
+        returns if key was held down at the start of the tick'''
+        return self.held[key]
 
-    def __str__(self):
-        '''str(SpaceInvadersFrame) -> str
-        returns a string with stats'''
-        name = self.nameVar.get()
+    def has_inputs(self):
+        '''Controls.has_inputs() -> bool
+        returns if any inputs are queued for the next tick'''
+        return len(self.queue) != 0
 
-        if name == "":
-            return "Lives: {}" + " "*12 + "Level: {}" + " "*12 + "Score: {}"
-        return name+" "*12+"Lives: {}" + " "*12 + "Level: {}" + " "*12 + "Score: {}" + " "*12 + "High Score: {}"
+    def press(self, name):
+        '''Controls.press(name) -> None
+        queues the input name (like "left down") for the next tick'''
+        self.queue.append(self.inputs.index(name))
 
-    def get_screen(self):
-        '''SpaceInvadersFrame.get_screen() -> TurtleScreen
-        returns the screen of the game'''
-        return self.screen
+    def drain(self):
+        '''Controls.drain() -> list
+        changes the keys held for all the queued inputs and returns their numbers'''
+        queue = self.queue
+        self.queue = []
+        for num in queue:
+            key, state = self.inputs[num].split()
+            self.held[key] = state == "down"
+        return queue
 
-    def get_canvas(self):
-        '''SpaceInvadersFrame.get_canvas() -> Canvas
-        returns the current tkinter canvas used for the game'''
-        return self.canvas
+class Replay:
+    '''a recording of the seed and every input of one game'''
 
-    def get_aliens(self):
-        '''SpaceInvadersFrame.get_aliens() -> Aliens
-        returns the aliens'''
-        return self.aliens
+    # file format: header, then one record per input
+    magic = b"SIRP"
+    # goes up whenever the same inputs would play a different game: 3 indexed
+    # aliens, 4 swept bullets, 5 pixel hits, 6 bullets leaving by the field's height,
+    # 7 levels and field size in the header, 8 field size as whole units,
+    # 9 formation laid out from the top of the field, 10 shooting columns picked in one draw,
+    # 11 explosion colors picked when they start
+    version = 11
+    header = struct.Struct("<4sBqB8sII") # magic, version, seed, lives, levels hash, field width and height
+    record = struct.Struct("<IB") # tick, input
 
-    def get_player(self):
-        '''SpaceInvadersFrame.get_player() -> Player
-        returns the player'''
-        return self.player
+    def __init__(self, seed, numLives=5, inputs=None, levelsHash=bytes(8), size=(1000, 700)):
+        '''Replay(seed, numLives=5, inputs=None, levelsHash=bytes(8), size=(1000, 700)) -> Replay
+        a replay of a game started with seed and numLives, with the levels
+        whose LevelConfig.get_hash is levelsHash on a field of size (width, height)
+        inputs is a list of (tick, input) in order'''
+        self.seed = seed
+        self.numLives = numLives
+        self.levelsHash = levelsHash
+        self.size = tuple(size)
+        if inputs == None:
+            inputs = []
+        self.inputs = inputs
+        self.position = 0
 
-    def get_spaceship(self):
-        '''SpaceInvadersFrame.get_spaceship() -> Spaceship
+    def __len__(self):
+        '''len(Replay) -> int
+        returns the number of inputs'''
+        return len(self.inputs)
+
+    def get_seed(self):
+        '''Replay.get_seed() -> int
+        returns the seed of the game'''
+        return self.seed
+
+    def get_num_lives(self):
+        '''Replay.get_num_lives() -> int
+        returns the number of lives the game started with'''
+        return self.numLives
+
+    def get_size(self):
+        '''Replay.get_size() -> tuple
+        returns the width and height of the field the game was played on'''
+        return self.size
+
+    def check(self, levels):
+        '''Replay.check(levels) -> None
+        raises ValueError if the game was not played with the LevelConfig levels'''
+        if levels.get_hash() != self.levelsHash:
+            raise ValueError("the replay was recorded with other levels than " + levels.fileName)
+
+    def add(self, tick, key):
+        '''Replay.add(tick, key) -> None
+        records that key was pressed on tick'''
+        self.inputs.append((tick, key))
+
+    def feed(self, game):
+        '''Replay.feed(game) -> None
+        presses the recorded keys for the game's next tick'''
+        while self.position < len(self.inputs) and self.inputs[self.position][0] <= game.get_num_ticks():
+            game.press(Controls.inputs[self.inputs[self.position][1]])
+            self.position += 1
+
+    def get_next_tick(self):
+        '''Replay.get_next_tick() -> int
+        returns the tick of the next input to feed, or None if every input has been fed'''
+        if self.is_done():
+            return None
+        return self.inputs[self.position][0]
+
+    def is_done(self):
+        '''Replay.is_done() -> bool
+        returns if every input has been fed'''
+        return self.position >= len(self.inputs)
+
+    def to_bytes(self):
+        '''Replay.to_bytes() -> bytes
+        returns the replay in its file format'''
+        data = [self.header.pack(self.magic, self.version, self.seed, self.numLives, self.levelsHash, *self.size)]
+        for tick, key in self.inputs:
+            data.append(self.record.pack(tick, key))
+        return b"".join(data)
+
+    def save(self, fileName):
+        '''Replay.save(fileName) -> None
+        writes the replay to fileName'''
+        write_file(fileName, self.to_bytes())
+
+def write_file(fileName, data):
+    '''write_file(fileName, data) -> None
+    writes the bytes data to fileName'''
+    file = open(fileName, "wb")
+    file.write(data)
+    file.close()
+
+def load_replay(fileName):
+    '''load_replay(fileName) -> Replay
+    reads a replay written by Replay.save'''
+    file = open(fileName, "rb")
+    data = file.read()
+    file.close()
+
+    if len(data) < Replay.header.size:
+        raise ValueError(fileName+" is not a space invaders replay")
+    magic, version = struct.unpack_from("<4sB", data)
+    if magic != Replay.magic or version != Replay.version:
+        raise ValueError(fileName+" is not a space invaders replay")
+    magic, version, seed, numLives, levelsHash, width, height = Replay.header.unpack_from(data)
+    if (len(data) - Replay.header.size) % Replay.record.size != 0:
+        raise ValueError(fileName+" is cut short")
+
+    inputs = list(Replay.record.iter_unpack(data[Replay.header.size:]))
+    return Replay(seed, numLives, inputs, levelsHash, (width, height))
+
+class ScoreStore:
+    '''every score of every player, kept in one sqlite database'''
+
+    schema = ("CREATE TABLE IF NOT EXISTS scores (id INTEGER PRIMARY KEY, name TEXT NOT NULL, "
+        "score INTEGER NOT NULL, level INTEGER NOT NULL, time REAL NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS scores_by_name ON scores (name, score)",
+        "CREATE INDEX IF NOT EXISTS scores_by_score ON scores (score)",
+        "CREATE TABLE IF NOT EXISTS imported (name TEXT PRIMARY KEY)")
+
+    def __init__(self, fileName="space_invaders_scores.db"):
+        '''ScoreStore(fileName="space_invaders_scores.db") -> ScoreStore
+        a store kept in the database in fileName, which create makes'''
+        self.fileName = fileName
+
+    def create(self):
+        '''ScoreStore.create() -> None
+        makes the database and its tables if they are not there yet'''
+        connection = self.connect()
+        for statement in self.schema:
+            connection.execute(statement)
+        connection.commit()
+        connection.close()
+
+    def connect(self):
+        '''ScoreStore.connect() -> Connection
+        returns a new connection to the database, one for each thread that uses it'''
+        return sqlite3.connect(self.fileName, timeout=10)
+
+    def add_score(self, name, score, level):
+        '''ScoreStore.add_score(name, score, level) -> None
+        saves a finished game of name'''
+        connection = self.connect()
+        with connection: # one transaction, so a score is saved whole or not at all
+            connection.execute("INSERT INTO scores (name, score, level, time) VALUES (?, ?, ?, ?)",
+                (name.lower(), score, level, time.time()))
+        connection.close()
+
+    def get_high_score(self, name):
+        '''ScoreStore.get_high_score(name) -> int
+        returns the best score of name, 0 if they have none'''
+        connection = self.connect()
+        highScore = connection.execute("SELECT MAX(score) FROM scores WHERE name = ?", (name.lower(),)).fetchone()[0]
+        connection.close()
+        return highScore or 0
+
+    def get_leaderboard(self, numPlayers=10):
+        '''ScoreStore.get_leaderboard(numPlayers=10) -> list
+        returns (name, score, level, time) of the best game of the top numPlayers players'''
+        connection = self.connect()
+        leaders = connection.execute("SELECT name, MAX(score), level, time FROM scores GROUP BY name "
+            "ORDER BY MAX(score) DESC, time LIMIT ?", (numPlayers,)).fetchall()
+        connection.close()
+        return leaders
+
+    def clear(self, name):
+        '''ScoreStore.clear(name) -> None
+        forgets every score of name'''
+        connection = self.connect()
+        with connection:
+            connection.execute("DELETE FROM scores WHERE name = ?", (name.lower(),))
+        connection.close()
+
+    def import_text_files(self, folder="."):
+        '''ScoreStore.import_text_files(folder=".") -> int
+        adds the high scores of the old space_invaders_<name>.txt files that were
+        not imported yet and returns how many were added
+        each file is only imported once, so a cleared high score stays cleared'''
+        connection = self.connect()
+        known = {row[0] for row in connection.execute("SELECT DISTINCT name FROM scores")}
+        imported = {row[0] for row in connection.execute("SELECT name FROM imported")}
+        rows = []
+        names = []
+        for fileName in glob.glob(os.path.join(folder, "space_invaders_*.txt")):
+            name = os.path.basename(fileName)[len("space_invaders_"):-len(".txt")].lower()
+            if name in imported:
+                continue
+            # players with scores from before this table was kept are taken as imported
+            names.append((name,))
+            if name in known:
+                continue
+            file = open(fileName)
+            text = file.read().split()
+            file.close()
+            if len(text) != 0 and text[-1].isdigit():
+                rows.append((name, int(text[-1]), 0, os.path.getmtime(fileName)))
+
+        with connection:
+            connection.executemany("INSERT INTO scores (name, score, level, time) VALUES (?, ?, ?, ?)", rows)
+            connection.executemany("INSERT OR IGNORE INTO imported (name) VALUES (?)", names)
+        connection.close()
+        return len(rows)
+
+class LevelConfig:
+    '''the difficulty of every level, read from a json file and worked out once'''
+
+    # the numbers that change from level to level
+    Level = collections.namedtuple("Level", ("moveWait", "moveSpeed", "numDown", "alienBullets",
+        "alienCooldown", "playerCooldown"))
+    default = None # the levels of levels.json, once read
+
+    def __init__(self, config, fileName="levels"):
+        '''LevelConfig(config, fileName="levels") -> LevelConfig
+        checks config, a dict read from the json file fileName, and works out every level
+        raises ValueError if config is not a proper level file'''
+        self.fileName = fileName
+        self.check(isinstance(config, dict), "is not a json object")
+        # replays keep this to tell if they are played with the same levels
+        self.hash = hashlib.sha256(json.dumps(config, sort_keys=True).encode()).digest()[:8]
+        self.maxLevel = self.get_number(config, "maxLevel", int, 1)
+
+        # size of the playing field in world units, (0,0) in the middle
+        field = self.get_section(config, "field")
+        self.width = self.get_number(field, "width", int, 1)
+        self.height = self.get_number(field, "height", int, 1)
+
+        # the formation hangs top below the top of the field and has rows
+        # down to shieldGap above the shields, as many as fit up to numRows
+        formation = self.get_section(config, "formation")
+        self.startX = self.get_number(formation, "startX", (int, float))
+        self.top = self.get_number(formation, "top", (int, float), 0)
+        self.shieldGap = self.get_number(formation, "shieldGap", (int, float), 0)
+        self.frameWait = self.get_number(formation, "frameWait", int, 1)
+        self.rowSpacing = self.get_number(formation, "rowSpacing", (int, float), 1)
+        self.numRows = self.get_number(formation, "numRows", int, 1)
+        columns = formation.get("columns")
+        self.check(isinstance(columns, list) and len(columns) != 0, "formation.columns must be a list of [x, type]")
+        for column in columns:
+            self.check(isinstance(column, list) and len(column) == 2 and isinstance(column[0], (int, float))
+                and column[1] in (1, 2, 3), "formation.columns must be a list of [x, type] with type 1, 2 or 3")
+        self.columns = tuple(tuple(column) for column in columns)
+        self.sideGap = self.get_number(formation, "sideGap", (int, float), 0)
+        self.alienBulletSpeed = self.get_number(formation, "bulletSpeed", (int, float), 0)
+
+        player = self.get_section(config, "player")
+        self.numBullets = self.get_number(player, "numBullets", int, 1)
+        self.playerSpeed = self.get_number(player, "speed", (int, float), 0)
+        self.playerBottom = self.get_number(player, "bottom", (int, float), 0)
+        self.playerBulletSpeed = self.get_number(player, "bulletSpeed", (int, float), 0)
+
+        shields = self.get_section(config, "shields")
+        xs = shields.get("xs")
+        self.check(isinstance(xs, list) and all(isinstance(x, (int, float)) and -1 <= x <= 1 for x in xs),
+            "shields.xs must be a list of numbers from -1 to 1")
+        self.shieldXs = tuple(xs) # parts of half the width of the field
+        self.shieldBottom = self.get_number(shields, "bottom", (int, float), 0)
+        self.shieldWidth = self.get_number(shields, "width", int, 1)
+        self.shieldHeight = self.get_number(shields, "height", int, 1)
+        self.shieldColor = shields.get("color")
+        self.check(self.shieldColor in COLORS, "shields.color must be one of " + ", ".join(COLORS))
+
+        # work out the table of levels
+        curves = self.get_section(config, "curves")
+        values = []
+        for name in self.Level._fields:
+            curve = self.get_section(curves, name)
+            values.append(self.make_curve(name, curve))
+        self.levels = [self.Level(*row) for row in zip(*values)]
+
+        for level in self.levels:
+            self.check(level.moveWait >= 1 and level.numDown >= 0 and level.alienBullets >= 0
+                and level.alienCooldown >= 0 and level.playerCooldown >= 0, "curves go out of range")
+        self.check(all(isinstance(level.moveWait, int) and isinstance(level.numDown, int)
+            and isinstance(level.alienBullets, int) for level in self.levels),
+            "moveWait, numDown and alienBullets must stay whole numbers")
+        self.maxAlienBullets = max(level.alienBullets for level in self.levels)
+
+    def check(self, condition, problem):
+        '''LevelConfig.check(condition, problem) -> None
+        raises ValueError about problem if condition is False'''
+        if not condition:
+            raise ValueError(self.fileName + ": " + problem)
+
+    def get_section(self, config, key):
+        '''LevelConfig.get_section(config, key) -> dict
+        returns the object under key'''
+        self.check(isinstance(config.get(key), dict), key + " must be a json object")
+        return config[key]
+
+    def get_number(self, config, key, kind, minimum=None):
+        '''LevelConfig.get_number(config, key, kind, minimum=None) -> number
+        returns the number under key, which must be of kind and at least minimum'''
+        value = config.get(key)
+        self.check(isinstance(value, kind) and not isinstance(value, bool) and (minimum == None or value >= minimum),
+            key + " must be a number" + (" of at least " + str(minimum) if minimum != None else ""))
+        return value
+
+    def get_pair(self, config, key):
+        '''LevelConfig.get_pair(config, key) -> list
+        returns the [x, y] under key'''
+        value = config.get(key)
+        self.check(isinstance(value, list) and len(value) == 2 and all(isinstance(x, (int, float)) for x in value),
+            key + " must be [x, y]")
+        return value
+
+    def make_curve(self, name, curve):
+        '''LevelConfig.make_curve(name, curve) -> list
+        returns the value of a curve for every level up to maxLevel
+        every [from, to, step] of the curve adds step at each level from..to (to null for no end)'''
+        value = self.get_number(curve, "start", (int, float))
+        steps = curve.get("steps")
+        self.check(isinstance(steps, list), name + ".steps must be a list of [from, to, step]")
+        for step in steps:
+            self.check(isinstance(step, list) and len(step) == 3 and isinstance(step[0], int)
+                and (step[1] == None or isinstance(step[1], int)) and isinstance(step[2], (int, float)),
+                name + ".steps must be a list of [from, to, step]")
+
+        values = []
+        for level in range(1, self.maxLevel+1):
+            for first, last, change in steps:
+                if first <= level and (last == None or level <= last):
+                    value += change
+            values.append(value)
+        return values
+
+    def get_columns(self, width):
+        '''LevelConfig.get_columns(width) -> list
+        returns the (x, type) of the columns that fit in a field width wide,
+        with room to move from startX before the formation turns around, in order'''
+        edge = width/2 - self.sideGap - abs(self.startX)
+        return sorted(column for column in self.columns if abs(column[0]) < edge)
+
+    def get_row_room(self, height):
+        '''LevelConfig.get_row_room(height) -> int
+        returns how many rows fit between the top of a field height high and the shields'''
+        top = height/2 - self.top
+        lowest = -height/2 + self.shieldBottom + self.shieldHeight/2 + self.shieldGap
+        if top < lowest:
+            return 0
+        return int((top-lowest)//self.rowSpacing) + 1
+
+    def check_field(self, width, height, numRows=None):
+        '''LevelConfig.check_field(width, height, numRows=None) -> None
+        raises ValueError if the formation, or numRows rows of it, does not fit in a width x height field'''
+        if len(self.get_columns(width)) == 0:
+            raise ValueError("a field "+str(width)+" wide is too narrow for the formation")
+        numFit = self.get_row_room(height)
+        if numFit == 0:
+            raise ValueError("a field "+str(height)+" high is too short for the formation")
+        if numRows != None and not 1 <= numRows <= numFit:
+            raise ValueError("a field "+str(height)+" high has room for "+str(numFit)+" rows, not "+str(numRows))
+
+    def get_level(self, level):
+        '''LevelConfig.get_level(level) -> LevelConfig.Level
+        returns the numbers for level, levels past maxLevel are like maxLevel'''
+        return self.levels[min(max(level, 1), self.maxLevel)-1]
+
+    def replace(self, **numbers):
+        '''LevelConfig.replace(**numbers) -> LevelConfig
+        returns a copy where every level has the given numbers, like alienCooldown=0'''
+        levels = copy.copy(self)
+        levels.levels = [level._replace(**numbers) for level in self.levels]
+        levels.hash = hashlib.sha256(self.hash + repr(sorted(numbers.items())).encode()).digest()[:8]
+        return levels
+
+    def get_hash(self):
+        '''LevelConfig.get_hash() -> bytes
+        returns 8 bytes that differ for levels that play differently'''
+        return self.hash
+
+def load_levels(fileName=None):
+    '''load_levels(fileName=None) -> LevelConfig
+    reads a level file, by default levels.json next to this file, which is only read once'''
+    if fileName == None:
+        if LevelConfig.default == None:
+            LevelConfig.default = load_levels(os.path.join(ASSET_DIR, "levels.json"))
+        return LevelConfig.default
+
+    file = open(fileName)
+    try:
+        config = json.load(file)
+    except json.JSONDecodeError as error:
+        raise ValueError(fileName + " is not json: " + str(error))
+    finally:
+        file.close()
+    return LevelConfig(config, fileName)
+
+class Game:
+    '''the game rules and state, without any drawing'''
+
+    def __init__(self, width=None, height=None, numLives=5, highScore=0, seed=None,
+                 numBullets=None, numAlienBullets=None, numRows=None, levels=None, assets=None):
+        '''Game(width=None, height=None, numLives=5, highScore=0, seed=None,
+        numBullets=None, numAlienBullets=None, numRows=None, levels=None, assets=None) -> Game
+        sets up the game data and components on a width x height field in world units
+        all randomness comes from seed, so the same seed and inputs play the same game
+        levels is a LevelConfig, levels.json by default, and the other arguments
+        change the size of the field and the numbers of bullets and rows it gives
+        assets gives the hitmasks of the sprites, the ones next to this file by default
+        numRows is by default as many rows as fit, up to the number levels gives
+        raises ValueError if the formation does not fit in the field'''
+        if levels == None:
+            levels = load_levels()
+        if assets == None:
+            assets = load_assets()
+        if width == None:
+            width = levels.width
+        if height == None:
+            height = levels.height
+        levels.check_field(width, height, numRows)
+
+        # randomness and inputs
+        if seed == None:
+            seed = random.randrange(2**63)
+        self.seed = seed
+        self.random = random.Random(seed)
+        self.numTicks = 0
+        self.controls = Controls()
+        self.replay = Replay(seed, numLives, levelsHash=levels.get_hash(), size=(width, height))
+
+        self.width = width
+        self.height = height
+        self.isOver = False
+        self.isEnded = False
+        self.changingLevel = False
+
+        # game data
+        self.levels = levels
+        self.assets = assets
+        self.lives = numLives
+        self.level = 1
+        self.score = 0
+        self.highScore = highScore
+
+        # game clock: a fixed timestep queue of callbacks in game time
+        self.tickTime = 5 # milliseconds of game time per simulation tick
+        # bullets sweep their whole path, so they can step less often than
+        # every tick without going through anything
+        self.bulletTicks = 6
+        self.gameTime = 0
+        self.timers = []
+        self.numTimers = 0
+        self.profiler = None
+        self.checkupQueued = False
+
+        # collisions
+        self.collisions = CollisionGrid(0, 0, width, height, 50)
+
+        # game components
+        self.shields = [Shield(self, round(x*width/2), -height/2+levels.shieldBottom, levels.shieldWidth,
+            levels.shieldHeight, levels.shieldColor) for x in levels.shieldXs]
+        self.shieldBoxes = [(shield, shield.get_box()) for shield in self.shields] # they never move
+        self.spaceship = Spaceship(self)
+        self.aliens = Aliens(self, levels, numRows, numAlienBullets)
+        if numBullets == None:
+            numBullets = levels.numBullets
+        self.player = Player(self, numBullets, levels.get_level(1).playerCooldown, levels.playerSpeed,
+            levels.playerBottom, levels.playerBulletSpeed)
+        self.aliens.start_movement(self.aliens.numPlans)
+        self.bullets = self.player.get_bullets() + self.aliens.get_bullets()
+
+        self.game_checkup()
+
+    def get_assets(self):
+        '''Game.get_assets() -> Assets
+        returns the sprites the hits are checked with'''
+        return self.assets
+
+    def get_width(self):
+        '''Game.get_width() -> int
+        returns the width of the playing field'''
+        return self.width
+
+    def get_height(self):
+        '''Game.get_height() -> int
+        returns the height of the playing field'''
+        return self.height
+
+    def get_levels(self):
+        '''Game.get_levels() -> LevelConfig
+        returns the difficulty of the levels'''
+        return self.levels
+
+    def get_collisions(self):
+        '''Game.get_collisions() -> CollisionGrid
+        returns the collision grid that every component is in'''
+        return self.collisions
+
+    def get_profiler(self):
+        '''Game.get_profiler() -> Profiler
+        returns the profiler timing the game, or None'''
+        return self.profiler
+
+    def set_profiler(self, profiler):
+        '''Game.set_profiler(profiler) -> None
+        times the game with profiler, or stops timing it if profiler is None'''
+        self.profiler = profiler
+
+    def get_random(self):
+        '''Game.get_random() -> Random
+        returns the game's random number generator'''
+        return self.random
+
+    def get_seed(self):
+        '''Game.get_seed() -> int
+        returns the seed of the game'''
+        return self.seed
+
+    def get_replay(self):
+        '''Game.get_replay() -> Replay
+        returns the recording of the game so far'''
+        return self.replay
+
+    def get_num_ticks(self):
+        '''Game.get_num_ticks() -> int
+        returns the number of ticks played'''
+        return self.numTicks
+
+    def get_aliens(self):
+        '''Game.get_aliens() -> Aliens
+        returns the aliens'''
+        return self.aliens
+
+    def get_player(self):
+        '''Game.get_player() -> Player
+        returns the player'''
+        return self.player
+
+    def get_spaceship(self):
+        '''Game.get_spaceship() -> Spaceship
         returns the spaceship'''
         return self.spaceship
 
     def get_shields(self):
-        '''SpaceInvadersFrame.get_shields() -> list
+        '''Game.get_shields() -> list
         returns a list of all shields'''
         return self.shields
 
+    def get_bullets(self):
+        '''Game.get_bullets() -> list
+        returns a list of the player's and the aliens' bullets'''
+        return self.bullets
+
+    def get_lives(self):
+        '''Game.get_lives() -> int
+        returns the number of lives left'''
+        return self.lives
+
+    def get_level(self):
+        '''Game.get_level() -> int
+        returns the current level'''
+        return self.level
+
+    def get_score(self):
+        '''Game.get_score() -> int
+        returns the score'''
+        return self.score
+
+    def get_high_score(self):
+        '''Game.get_high_score() -> int
+        returns the high score'''
+        return self.highScore
+
+    def set_high_score(self, highScore):
+        '''Game.set_high_score(highScore) -> None
+        sets the high score, unless this game already beat it'''
+        self.highScore = max(highScore, self.score)
+
+    def get_time(self):
+        '''Game.get_time() -> float
+        returns the game time in seconds'''
+        return self.gameTime/1000
+
     def is_over(self):
-        '''SpaceInvadersFrame.is_over() -> bool
-        returns if the game is over'''
+        '''Game.is_over() -> bool
+        returns if the game is over or paused between levels'''
         return self.isOver
 
+    def is_ended(self):
+        '''Game.is_ended() -> bool
+        returns if the game has been lost'''
+        return self.isEnded
+
+    def is_changing_level(self):
+        '''Game.is_changing_level() -> bool
+        returns if the game is paused before a new level'''
+        return self.changingLevel
+
+    def schedule(self, callback, wait, *args):
+        '''Game.schedule(callback, wait, *args) -> None
+        calls callback(*args) once after wait milliseconds of game time'''
+        self.numTimers += 1
+        heapq.heappush(self.timers, (self.gameTime+wait, self.numTimers, callback, args))
+
+    def get_controls(self):
+        '''Game.get_controls() -> Controls
+        returns the keys held down'''
+        return self.controls
+
+    def press(self, name):
+        '''Game.press(name) -> None
+        gives the input name (one of Controls.inputs) at the start of the next tick'''
+        self.controls.press(name)
+
+    def get_quiet_ticks(self, maxTicks=math.inf):
+        '''Game.get_quiet_ticks(maxTicks=math.inf) -> int
+        returns how many ticks from now on, up to maxTicks, only move the player,
+        the aliens to the side, the spaceship and bullets that cannot hit anything:
+        no inputs, timers or shots, and no player moving into the aliens'''
+        if self.controls.has_inputs():
+            return 0
+        numTicks = maxTicks
+        if len(self.timers) != 0:
+            # the first tick whose end reaches the next timer runs it
+            numTicks = min(numTicks, math.ceil(self.timers[0][0]/self.tickTime) - 1 - self.numTicks)
+        if not self.isOver and numTicks > 0:
+            # the player may move into the aliens once they are as low as it
+            box = self.aliens.get_box()
+            if box != None and box[1] <= self.player.ycor()+15:
+                left, right = self.aliens.get_drift()
+                numTicks = min(numTicks, self.player.get_ticks_outside(box[0]-left, box[2]+right,
+                    self.tickTime/1000))
+            if self.controls.is_held("shoot"):
+                shot = self.player.get_shot_tick(self.numTicks, self.tickTime)
+                if shot != None:
+                    numTicks = min(numTicks, shot - self.numTicks)
+
+            # bullets step every bulletTicks ticks from the first, and only the steps
+            # that cannot hit anything, wherever things move in the meantime, are gone over
+            first = -self.numTicks % self.bulletTicks
+            targets = None
+            for bullet in self.bullets:
+                if bullet.isMoving and first < numTicks:
+                    if targets == None:
+                        targets = self.get_targets(numTicks)
+                    numSteps = bullet.get_free_steps(self.bulletTicks*self.tickTime/1000, targets)
+                    numTicks = min(numTicks, first + numSteps*self.bulletTicks)
+        return max(numTicks, 0)
+
+    def get_targets(self, numTicks):
+        '''Game.get_targets(numTicks) -> list
+        returns (obj, box) for everything bullets can hit, each box widened to
+        take in wherever it may move to the side over the next numTicks ticks'''
+        targets = self.shieldBoxes.copy()
+        movers = [(self.player, self.player.get_drift(numTicks, self.tickTime/1000))]
+        if len(self.aliens) != 0:
+            movers.append((self.aliens, self.aliens.get_drift()))
+        # the spaceship can only be hit while it is going across
+        if self.spaceship.is_moving():
+            movers.append((self.spaceship, self.spaceship.get_drift()))
+        for obj, (left, right) in movers:
+            box = obj.get_box()
+            targets.append((obj, (box[0]-left, box[1], box[2]+right, box[3])))
+        return targets
+
+    def advance(self, numTicks):
+        '''Game.advance(numTicks) -> None
+        runs the game up to tick numTicks, or until it ends, the same as calling tick
+        for every tick but going over the ticks that only move things at once'''
+        while self.numTicks < numTicks and not self.isEnded:
+            self.take_inputs()
+            quiet = self.get_quiet_ticks(numTicks - self.numTicks)
+            if quiet == 0:
+                self.tick()
+                continue
+            if not self.isOver:
+                self.player.glide(quiet, self.tickTime/1000)
+                numSteps = (self.numTicks+quiet-1)//self.bulletTicks - (self.numTicks-1)//self.bulletTicks
+                for bullet in self.bullets:
+                    if bullet.isMoving:
+                        bullet.glide(numSteps, self.bulletTicks*self.tickTime/1000)
+            self.numTicks += quiet
+            self.gameTime += quiet*self.tickTime
+        # the moves in the ticks gone over
+        self.catch_up()
+
+    def take_inputs(self):
+        '''Game.take_inputs() -> None
+        changes the keys held for the inputs given since the last tick,
+        recording them until the game has ended'''
+        for num in self.controls.drain():
+            if not self.isEnded:
+                self.replay.add(self.numTicks, num)
+
+    def tick(self):
+        '''Game.tick() -> None
+        advances the game by one simulation tick'''
+        self.take_inputs()
+        self.catch_up()
+        if not self.isOver:
+            self.player.update(self.tickTime/1000)
+            if self.numTicks % self.bulletTicks == 0:
+                if self.profiler == None:
+                    self.update_bullets(self.bulletTicks*self.tickTime/1000)
+                else:
+                    self.profiler.time_call("Game.update_bullets", self.update_bullets,
+                        self.bulletTicks*self.tickTime/1000)
+        self.numTicks += 1
+
+        end = self.gameTime + self.tickTime
+
+        # run every callback that is due in this tick in order
+        while len(self.timers) != 0 and self.timers[0][0] <= end:
+            self.gameTime, num, callback, args = heapq.heappop(self.timers)
+            if self.profiler == None:
+                callback(*args)
+            else:
+                self.profiler.time_call(callback.__qualname__, callback, *args)
+        self.gameTime = end
+        self.catch_up()
+
+    def catch_up(self):
+        '''Game.catch_up() -> None
+        makes the aliens' and the spaceship's moves that were left until they are due'''
+        self.aliens.catch_up()
+        self.spaceship.catch_up()
+
+    def update_bullets(self, dt):
+        '''Game.update_bullets(dt) -> None
+        moves every flying bullet for dt seconds'''
+        for bullet in self.bullets:
+            if bullet.isMoving:
+                bullet.update(dt)
+
+    def hit_player(self, bullet):
+        '''Game.hit_player(bullet) -> None
+        takes a life for bullet hitting the player'''
+        self.lives -= 1
+        bullet.explode(*Bullet.playerExplosion)
+        self.add_score()
+        if self.lives == 0:
+            self.request_checkup()
+
     def add_score(self, scoreToAdd=0):
-        '''SpaceInvadersFrame.add_score(scoreToAdd) -> None
+        '''Game.add_score(scoreToAdd) -> None
         adds scoreToAdd to score'''
         # update score and high score
         self.score += scoreToAdd
         if self.score > self.highScore:
             self.highScore = self.score
-            
-        self.canvas.itemconfigure(self.scoreLabel, text=str(self).format(self.lives, self.level, self.score, self.highScore))
+
+    def is_player_reached(self):
+        '''Game.is_player_reached() -> bool
+        returns if the point where the aliens get the player is in the box around them'''
+        box = self.aliens.get_box()
+        x,y = self.player.xcor(), self.player.ycor()+15
+        return box != None and box[0] <= x <= box[2] and box[1] <= y <= box[3]
+
+    def request_checkup(self):
+        '''Game.request_checkup() -> None
+        runs game_checkup once after what is running now, for when the game may be lost or won'''
+        if not self.checkupQueued:
+            self.checkupQueued = True
+            self.schedule(self.game_checkup, 0)
 
     def game_checkup(self):
-        '''SpaceInvadersFrame.game_checkup() -> None
-        checks up on the game. Calls itself every 11 milliseconds'''
+        '''Game.game_checkup() -> None
+        checks up on the game, whenever the lives, the aliens or where they are have changed'''
+        self.checkupQueued = False
         if self.isOver:
             return
-        
+
         # check if game is lost
-        if self.lives == 0 or self.aliens.is_hit((self.player.xcor(), self.player.ycor()+15))[0]:
+        x,y = self.player.xcor(), self.player.ycor()+15
+        if self.lives == 0 or (self.is_player_reached() and self.aliens.is_hit((x, y))[0]):
             self.end_game()
             return
 
-        # check if hit
-        for bullet in self.aliens.get_bullets():
-            x,y = bullet.pos()
-            # check if bullet has hit player
-            if self.player.xcor()-23 <= x <= self.player.xcor()+23 and \
-               self.player.ycor()-30 <= y <= self.player.ycor()+20 and bullet.is_moving() and \
-               bullet.isvisible():
-                self.lives -= 1
-                bullet.explode(["red","dark orange","gold"],30)
-                self.add_score()
-
         # next level
         if len(self.aliens) == 0:
             self.new_level()
 
-        self.screen.ontimer(self.game_checkup, 8)
-
     def end_game(self):
-        '''SpaceInvadersFrame.end_game() -> None
+        '''Game.end_game() -> None
         ends the game'''
         # stop everything
         self.isOver = True
-        self.player.shape("broken_player.gif")
-        self.screen.update()
-        self.save_high_score()
+        self.isEnded = True
+        self.player.isBroken = True
         self.lives = 0
         self.add_score()
 
-        # add the final text
-        self.canvas.create_text(0,0, text="Game Over!", fill="white", font=("Arial", 100))
-
     def new_level(self):
-        '''SpaceInvadersFrame.new_level() -> None
+        '''Game.new_level() -> None
         starts a new level'''
         self.level += 1
         self.isOver = True
-        self.newLevelText = self.canvas.create_text(0,0, text="Level " + str(self.level), font=("Arial", 100), fill="White")
-        self.screen.ontimer(self.start_up, 2500)
+        self.changingLevel = True
+        self.schedule(self.start_up, 2500)
 
     def start_up(self):
-        '''SpaceInvadersFrame.start_up() -> None
+        '''Game.start_up() -> None
         starts up the game'''
-        # move all alien bullets
-        for alienBullet in self.aliens.get_bullets():
-            alienBullet.goto(0, 500)
-        # move player bullets
+        # stop the player's bullets, the aliens reset theirs
         for playerBullet in self.player.get_bullets():
-            playerBullet.goto(0,-500)
-            playerBullet.explode()
+            playerBullet.reset()
         # reset shields
         for shield in self.shields:
-            for hole in shield.get_holes():
-                self.canvas.delete(hole[3])
-            shield.get_holes().clear()
-            
+            shield.reset()
+
         self.isOver = False
-        self.spaceship.ht()
-        oldSpaceship = self.spaceship
-        self.spaceship = Spaceship(self)
-        del oldSpaceship
-        
-        self.aliens.restart(self.level)
+        self.changingLevel = False
+        self.spaceship.reset()
+
         self.player.setx(0)
+        self.aliens.restart(self.level)
+        self.player.set_cooldown(self.levels.get_level(self.level).playerCooldown)
         self.game_checkup()
         self.add_score()
-        self.canvas.delete(self.newLevelText)
-        self.screen.update()
+
+class Profiler:
+    '''records how long each part of the game takes in every frame'''
+
+    # names of the timed parts
+    names = {"Aliens.start_movement": "alien movement", "Game.update_bullets": "bullet stepping",
+        "Shield.sweep": "shield checks", "Bullet.explosion": "explosions",
+        "Spaceship.start_movement": "spaceship", "Game.game_checkup": "game_checkup",
+        "Game.start_up": "new level", "draw": "drawing", "update": "canvas update"}
+    # the part each part is timed inside of, if any
+    parents = {"Shield.sweep": "Game.update_bullets"}
+    # upper edges in milliseconds of the histogram bins
+    bins = (0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1, 2, 5, 10, 20, 50, 100)
+
+    def __init__(self, historyLength=600, clock=time.perf_counter):
+        '''Profiler(historyLength=600, clock=time.perf_counter) -> Profiler
+        a profiler that keeps the last historyLength frames'''
+        self.clock = clock
+        self.current = {}
+        self.history = collections.deque(maxlen=historyLength)
+        self.lastStart = None
+        self.lastEnd = None
+        self.wait = 0
+
+    def time_call(self, section, function, *args):
+        '''Profiler.time_call(section, function, *args) -> object
+        calls function(*args), adding the time it takes to section'''
+        start = self.clock()
+        result = function(*args)
+        self.current[section] = self.current.get(section, 0) + self.clock() - start
+        return result
+
+    def start_frame(self):
+        '''Profiler.start_frame() -> None
+        marks the start of a frame'''
+        now = self.clock()
+        self.frame = {"sections": {}}
+        if self.lastStart != None:
+            self.frame["interval"] = (now-self.lastStart)*1000
+        # how late the timer called the frame
+        if self.lastEnd != None:
+            self.frame["jitter"] = (now-self.lastEnd)*1000 - self.wait
+        self.lastStart = now
+
+    def end_frame(self, wait, numItems):
+        '''Profiler.end_frame(wait, numItems) -> None
+        marks the end of a frame with numItems canvas items, the next
+        frame being asked for in wait milliseconds'''
+        self.frame["sections"] = {section: seconds*1000 for section, seconds in self.current.items()}
+        self.frame["items"] = numItems
+        self.history.append(self.frame)
+        self.current = {}
+        self.wait = wait
+        self.lastEnd = self.clock()
+
+    def get_values(self, key, section=None, numFrames=None):
+        '''Profiler.get_values(key, section=None, numFrames=None) -> list
+        returns key (or the time of section) for each of the last numFrames frames'''
+        frames = list(self.history)
+        if numFrames != None:
+            frames = frames[-numFrames:]
+        if section != None:
+            return [frame["sections"].get(section, 0) for frame in frames]
+        return [frame[key] for frame in frames if key in frame]
+
+    def get_fps(self, numFrames=60):
+        '''Profiler.get_fps(numFrames=60) -> float
+        returns the frames per second over the last numFrames frames'''
+        intervals = self.get_values("interval", numFrames=numFrames)
+        if len(intervals) == 0:
+            return 0
+        return 1000*len(intervals)/max(sum(intervals), 1e-9)
+
+    def get_text(self, numFrames=60):
+        '''Profiler.get_text(numFrames=60) -> str
+        returns the averages over the last numFrames frames to show on screen'''
+        jitter = self.get_values("jitter", numFrames=numFrames)
+        items = self.get_values("items", numFrames=numFrames)
+        lines = ["FPS {:.1f}   jitter {:.2f} ms   items {}".format(self.get_fps(numFrames),
+            sum(jitter)/max(len(jitter), 1), items[-1] if len(items) != 0 else 0)]
+        for section, name in self.names.items():
+            times = self.get_values(None, section, numFrames)
+            if section in self.parents:
+                name = " " + name
+            lines.append("{:<18}{:>8.3f} ms".format(name, sum(times)/max(len(times), 1)))
+        return "\n".join(lines)
+
+    def get_histogram(self, values):
+        '''Profiler.get_histogram(values) -> dict
+        returns the count of values in each bin and their summary'''
+        counts = [0]*(len(self.bins)+1)
+        for value in values:
+            counts[bisect.bisect_left(self.bins, value)] += 1
+        return {"bins": list(self.bins), "counts": counts, "mean": sum(values)/max(len(values), 1),
+            "p50": percentile(values, 0.5), "p95": percentile(values, 0.95), "max": max(values, default=0)}
+
+    def dump(self, fileName):
+        '''Profiler.dump(fileName) -> None
+        saves histograms of the frames kept as json to fileName'''
+        report = {"frames": len(self.history), "fps": self.get_fps(len(self.history)),
+            "interval": self.get_histogram(self.get_values("interval")),
+            "jitter": self.get_histogram(self.get_values("jitter")),
+            "items": self.get_histogram(self.get_values("items")), "sections": {}}
+        for section, name in self.names.items():
+            report["sections"][name] = self.get_histogram(self.get_values(None, section))
+
+        file = open(fileName, "w")
+        json.dump(report, file, indent=2)
+        file.close()
+
+class Assets:
+    '''loads every sprite of the game once, from the folder of this file'''
+
+    # key -> files to try in order
+    files = {"player": ("player.gif",), "broken player": ("broken_player.gif",), "spaceship": ("spaceship.gif",)}
+    files.update({(alienNum, frame): ("alien_{}_frame_{}.gif".format(alienNum, frame),
+        "alien_{}_frame_{}.png".format(alienNum, frame)) for alienNum in range(1,4) for frame in range(1,3)})
+
+    # sprites drawn here when their files are missing
+    placeholders = {"spaceship": (100, 40)}
+
+    # the assets next to this file, see load_assets
+    default = None
+
+    def __init__(self, folder=ASSET_DIR, clock=time.perf_counter):
+        '''Assets(folder=ASSET_DIR, clock=time.perf_counter) -> Assets
+        reads and checks every sprite in folder, and makes the hitmask of each
+        raises ValueError if a sprite is missing or not a gif or png'''
+        self.folder = folder
+        self.clock = clock
+        self.data = {} # key -> (format, width, height, bytes)
+        self.images = {} # key -> PhotoImage
+        self.masks = {} # key -> Hitmask
+        self.pixels = {} # key -> (width, height, RGBA pixels)
+        self.times = {} # step -> milliseconds
+        self.generated = []
+
+        start = self.clock()
+        for key, fileNames in self.files.items():
+            self.data[key] = self.read(key, fileNames)
+        self.times["read"] = (self.clock()-start)*1000
+
+        start = self.clock()
+        for key, (kind, width, height, data) in self.data.items():
+            try:
+                self.pixels[key] = decode_image(data)[:3]
+                self.masks[key] = Hitmask(*self.pixels[key])
+            except ValueError as error:
+                raise ValueError("can't read the pixels of sprite " + str(key) + ": " + str(error))
+        self.times["masks"] = (self.clock()-start)*1000
+
+    def read(self, key, fileNames):
+        '''Assets.read(key, fileNames) -> tuple
+        returns the format, width, height and data of the first of fileNames there is'''
+        for fileName in fileNames:
+            path = os.path.join(self.folder, fileName)
+            if not os.path.exists(path):
+                continue
+            file = open(path, "rb")
+            data = file.read()
+            file.close()
+            try:
+                return read_image_size(data) + (data,)
+            except ValueError:
+                raise ValueError(fileName + " is not a gif or png image")
+
+        if key not in self.placeholders:
+            raise ValueError("missing image " + fileNames[0])
+        width, height = self.placeholders[key]
+        self.generated.append(key)
+        return "png", width, height, encode_png(width, height, draw_saucer(width, height))
+
+    def make_images(self):
+        '''Assets.make_images() -> None
+        makes a PhotoImage of every sprite, needs a Tk window'''
+        start = self.clock()
+        for key, (kind, width, height, data) in self.data.items():
+            if key not in self.images:
+                self.images[key] = PhotoImage(format=kind, data=base64.b64encode(data).decode())
+        self.times["images"] = (self.clock()-start)*1000
+
+    def get_image(self, key):
+        '''Assets.get_image(key) -> PhotoImage
+        returns the image of key, like "player" or (alien type, frame)'''
+        return self.images[key]
+
+    def get_pixels(self, key):
+        '''Assets.get_pixels(key) -> int, int, bytearray
+        returns the width, height and RGBA pixels of the sprite of key'''
+        return self.pixels[key]
+
+    def get_mask(self, key):
+        '''Assets.get_mask(key) -> Hitmask
+        returns the solid pixels of the sprite of key'''
+        return self.masks[key]
+
+    def get_size(self, key):
+        '''Assets.get_size(key) -> int, int
+        returns the width and height of the sprite of key'''
+        return self.data[key][1:3]
+
+    def get_generated(self):
+        '''Assets.get_generated() -> list
+        returns the keys of the sprites that were drawn instead of loaded'''
+        return self.generated
+
+    def get_times(self):
+        '''Assets.get_times() -> dict
+        returns how many milliseconds each step of loading took'''
+        return self.times
+
+    def get_report(self):
+        '''Assets.get_report() -> str
+        returns a line about how long loading took'''
+        text = "loaded {} sprites in {:.1f} ms".format(len(self.data), sum(self.times.values()))
+        text += " (" + ", ".join("{} {:.1f} ms".format(step, ms) for step, ms in self.times.items()) + ")"
+        if len(self.generated) != 0:
+            text += ", drew " + ", ".join(self.generated)
+        return text
+
+def load_assets():
+    '''load_assets() -> Assets
+    returns the sprites next to this file, which are only read once'''
+    if Assets.default == None:
+        Assets.default = Assets()
+    return Assets.default
+
+class Viewport:
+    '''maps the world units of a game onto the pixels of a canvas'''
+
+    def __init__(self, worldWidth, worldHeight, width=None, height=None):
+        '''Viewport(worldWidth, worldHeight, width=None, height=None) -> Viewport
+        fits a worldWidth x worldHeight field into width x height pixels,
+        by default one pixel per world unit'''
+        if width == None:
+            width = worldWidth
+        if height == None:
+            height = worldHeight
+        self.width = width
+        self.height = height
+        self.scale = min(width/worldWidth, height/worldHeight)
+        # images can only be scaled by whole numbers, so zoom then subsample
+        self.fraction = fractions.Fraction(self.scale).limit_denominator(8)
+
+    def get_size(self):
+        '''Viewport.get_size() -> int, int
+        returns the width and height in pixels'''
+        return self.width, self.height
+
+    def get_scale(self):
+        '''Viewport.get_scale() -> float
+        returns the pixels per world unit'''
+        return self.scale
+
+    def to_screen(self, x, y):
+        '''Viewport.to_screen(x, y) -> float, float
+        returns the canvas position of world position (x,y)'''
+        return x*self.scale, -y*self.scale
+
+    def make_canvas(self, master):
+        '''Viewport.make_canvas(master) -> Canvas
+        returns a black canvas of the viewport's size with (0,0) in the middle'''
+        return Canvas(master, width=self.width, height=self.height, bg="black",
+            scrollregion=(-self.width//2, -self.height//2, self.width//2, self.height//2))
+
+    def scale_image(self, image):
+        '''Viewport.scale_image(image) -> PhotoImage
+        returns image scaled to the viewport'''
+        if self.fraction == 1:
+            return image
+        return image.zoom(self.fraction.numerator).subsample(self.fraction.denominator)
+
+    def scale_font(self, font):
+        '''Viewport.scale_font(font) -> tuple
+        returns font with its size scaled to the viewport'''
+        return (font[0], max(round(font[1]*self.scale), 1)) + tuple(font[2:])
+
+class Hud:
+    '''the line of stats along the top of the screen, one canvas text per stat'''
+
+    # label of each stat and the Game method that gives it
+    stats = (("Lives: ", "get_lives"), ("Level: ", "get_level"), ("Score: ", "get_score"),
+        ("High Score: ", "get_high_score"))
+
+    def __init__(self, game, canvas, viewport, y, name=""):
+        '''Hud(game, canvas, viewport, y, name="") -> Hud
+        makes the texts for the stats of game at world height y, showing name
+        and the high score only if there is a name'''
+        self.canvas = canvas
+        stats = self.stats if name != "" else self.stats[:3]
+        numItems = len(stats) + (name != "")
+        spacing = 190*viewport.get_scale()
+        font = viewport.scale_font(("Arial",17))
+        screenY = viewport.to_screen(0, y)[1]
+        positions = [(index-(numItems-1)/2)*spacing for index in range(numItems)]
+
+        if name != "":
+            self.canvas.create_text(positions.pop(0), screenY, text=name, font=font, fill="white",
+                tags=("static", "hud"))
+        self.items = [] # (label, getter, text item)
+        for (label, method), x in zip(stats, positions):
+            self.items.append((label, getattr(game, method), self.canvas.create_text(x, screenY, text="", font=font,
+                fill="white", tags=("static", "hud"))))
+        self.values = [None]*len(self.items)
+
+    def update(self):
+        '''Hud.update() -> int
+        rewrites the stats that changed since the last update, all the score
+        changes of a frame at once, and returns how many were rewritten'''
+        numChanged = 0
+        for index, (label, getter, item) in enumerate(self.items):
+            value = getter()
+            if value != self.values[index]:
+                self.values[index] = value
+                self.canvas.itemconfigure(item, text=label+str(value))
+                numChanged += 1
+        return numChanged
+
+class GameRenderer:
+    '''draws a game on a tkinter canvas whose scrollregion centers (0,0)
+
+    items are in layers by tag: "static" (shields, stats), "dynamic"
+    (aliens, bullets, spaceship, player, explosions) and "overlay" (messages)
+    and only the items that changed since the last frame are touched'''
+
+    def __init__(self, game, canvas, name, assets, viewport=None):
+        '''GameRenderer(game, canvas, name, assets, viewport=None) -> GameRenderer
+        sets up the canvas items for game with the images of assets
+        name is the player's name for the stats, or "" to play anonymously
+        viewport is the Viewport of the canvas, by default one pixel per world unit'''
+        assets.make_images()
+        if viewport == None:
+            viewport = Viewport(game.get_width(), game.get_height())
+        self.viewport = viewport
+        scale = self.scale = viewport.get_scale()
+        self.game = game
+        self.canvas = canvas
+        self.places = {} # item -> where it was last drawn
+        self.states = {} # item -> if it was last shown
+        self.numChanged = 0
+
+        # static layer
+        self.hud = Hud(game, self.canvas, viewport, game.get_height()/2-30, name)
+
+        # shields: one image per shield that the holes are painted into
+        self.shieldImages = []
+        self.shieldDrawn = []
+        for shield in game.get_shields():
+            image = PhotoImage(width=round(shield.width*scale), height=round(shield.height*scale))
+            self.canvas.create_image(viewport.to_screen(shield.x, shield.y), image=image, tags="static")
+            self.shieldImages.append(image)
+            self.shieldDrawn.append([None, 0]) # resets and changes drawn
+
+        # dynamic layer
+        self.brokenPlayerImage = viewport.scale_image(assets.get_image("broken player"))
+        self.spaceshipImage = viewport.scale_image(assets.get_image("spaceship"))
+        self.playerImage = viewport.scale_image(assets.get_image("player"))
+        self.spaceship = self.canvas.create_image(0, 0, image=self.spaceshipImage, state="hidden", tags="dynamic")
+        self.states[self.spaceship] = False
+        self.bullets = [self.canvas.create_polygon(0, 0, 0, 0, 0, 0, fill=bullet.get_color(),
+            outline=bullet.get_color(), state="hidden", tags="dynamic") for bullet in game.get_bullets()]
+        for item in self.bullets:
+            self.states[item] = False
+        self.player = self.canvas.create_image(0, 0, image=self.playerImage, tags="dynamic")
+        self.playerBroken = False
+
+        # aliens: one canvas image per alien, all tagged "aliens" and by type
+        self.alienTags = {alienNum: ("dynamic", "aliens", "alien_"+str(alienNum)) for alienNum in range(1,4)}
+        self.alienImages = {frame: [(self.alienTags[alienNum][2], viewport.scale_image(assets.get_image((alienNum, frame))))
+            for alienNum in range(1,4)] for frame in range(1,3)}
+        self.alienItems = {}
+        self.alienPos = None
+        self.alienFrame = None
+
+        # explosions: every ring of every kind of explosion is drawn now,
+        # then shown by a pool of canvas images
+        self.explosionImages = {}
+        kinds = list(Bullet.alienExplosions.values()) + [Bullet.spaceshipExplosion, Bullet.playerExplosion]
+        for colors, size, speed in kinds:
+            for color in colors:
+                for radius in range(5, size+1, speed):
+                    self.get_explosion_image(color, radius)
+        self.freeEffects = [self.canvas.create_image(0, 0, state="hidden", tags="dynamic") for i in range(8)]
+        self.effects = {} # bullet -> [item, (color, radius), pos]
+
+        # overlay layer: messages in the middle of the screen
+        self.gameOverText = None
+        self.levelText = None
+
+    def place(self, item, x, y):
+        '''GameRenderer.place(item, x, y) -> None
+        moves item to (x,y) if it is not there already'''
+        if self.places.get(item) != (x,y):
+            self.places[item] = x,y
+            self.canvas.coords(item, x*self.scale, -y*self.scale)
+            self.numChanged += 1
+
+    def show(self, item, isShown):
+        '''GameRenderer.show(item, isShown) -> None
+        shows or hides item if it is not already'''
+        if self.states.get(item) != isShown:
+            self.states[item] = isShown
+            self.canvas.itemconfigure(item, state="normal" if isShown else "hidden")
+            self.numChanged += 1
+
+    def get_num_changed(self):
+        '''GameRenderer.get_num_changed() -> int
+        returns the number of canvas changes made by the last draw'''
+        return self.numChanged
+
+    def get_explosion_image(self, color, radius):
+        '''GameRenderer.get_explosion_image(color, radius) -> PhotoImage
+        returns the image of a ring of an explosion, drawing it if needed'''
+        if (color, radius) not in self.explosionImages:
+            rgb = COLORS.get(color)
+            if rgb == None:
+                rgb = tuple(value//256 for value in self.canvas.winfo_rgb(color))
+            size, pixels = draw_ring(radius*self.scale, 5*self.scale, rgb)
+            self.explosionImages[color, radius] = PhotoImage(format="png",
+                data=base64.b64encode(encode_png(size, size, pixels)).decode())
+        return self.explosionImages[color, radius]
+
+    def draw(self):
+        '''GameRenderer.draw() -> None
+        brings the canvas items that changed up to date with the game'''
+        self.numChanged = 0
+        self.draw_aliens()
+        self.draw_bullets()
+        self.draw_shields()
+
+        # spaceship
+        spaceship = self.game.get_spaceship()
+        if spaceship.isvisible():
+            self.place(self.spaceship, *spaceship.pos())
+        self.show(self.spaceship, spaceship.isvisible())
+
+        # player
+        player = self.game.get_player()
+        self.place(self.player, *player.pos())
+        if player.is_broken() and not self.playerBroken:
+            self.playerBroken = True
+            self.canvas.itemconfigure(self.player, image=self.brokenPlayerImage)
+
+        self.draw_text()
+
+    def draw_aliens(self):
+        '''GameRenderer.draw_aliens() -> None
+        moves, animates and removes the alien images'''
+        aliens = self.game.get_aliens()
+
+        # new formation
+        if len(aliens) > len(self.alienItems):
+            self.make_aliens()
+            return
+
+        # destroyed aliens
+        for cell in aliens.take_destroyed():
+            if cell in self.alienItems:
+                self.canvas.delete(self.alienItems.pop(cell))
+
+        # move the whole formation
+        x,y = aliens.get_pos()
+        if (x,y) != self.alienPos:
+            self.canvas.move("aliens", (x-self.alienPos[0])*self.scale, (self.alienPos[1]-y)*self.scale)
+            self.alienPos = x,y
+            self.numChanged += 1
+
+        # animation frame
+        frame = aliens.get_frame()
+        if frame != self.alienFrame:
+            self.alienFrame = frame
+            for tag, image in self.alienImages[frame]:
+                self.canvas.itemconfigure(tag, image=image)
+
+    def make_aliens(self):
+        '''GameRenderer.make_aliens() -> None
+        makes a canvas image for each alien of a new formation'''
+        aliens = self.game.get_aliens()
+        self.canvas.delete("aliens")
+        self.alienItems.clear()
+        aliens.take_destroyed()
+
+        x,y = aliens.get_pos()
+        frame = aliens.get_frame()
+        self.alienPos = x,y
+        self.alienFrame = frame
+        for cell in aliens.get_cells():
+            (alienX, alienY), alienNum = aliens.get_alien(cell)
+            self.alienItems[cell] = self.canvas.create_image(self.viewport.to_screen(alienX+x, alienY+y),
+                image=self.alienImages[frame][alienNum-1][1], tags=self.alienTags[alienNum])
+        self.canvas.tag_raise("overlay")
+
+    def draw_bullets(self):
+        '''GameRenderer.draw_bullets() -> None
+        moves the bullets and shows the explosions'''
+        bullets = self.game.get_bullets()
+        for bullet, item in zip(bullets, self.bullets):
+            if bullet.isvisible():
+                # a thin triangle pointing the way the bullet goes
+                x,y = bullet.pos()
+                if self.places.get(item) != (x,y):
+                    self.places[item] = x,y
+                    x, y = x*self.scale, y*self.scale
+                    dx, dy = bullet.dx*self.scale, bullet.dy*self.scale
+                    self.canvas.coords(item, x+8.1*dx, -y-8.1*dy, x-4*dx-2*dy, -y-4*dy+2*dx,
+                        x-4*dx+2*dy, -y-4*dy-2*dx)
+                    self.numChanged += 1
+            self.show(item, bullet.isvisible())
+
+        self.draw_explosions(bullets)
+
+    def draw_explosions(self, bullets):
+        '''GameRenderer.draw_explosions(bullets) -> None
+        shows the current ring of each explosion with the pool of effect images'''
+        # give back the images of finished explosions
+        for bullet in list(self.effects):
+            if bullet.get_explosion() == None or bullet not in bullets:
+                effect = self.effects.pop(bullet)
+                self.canvas.itemconfigure(effect[0], state="hidden")
+                self.freeEffects.append(effect[0])
+
+        for bullet in bullets:
+            explosion = bullet.get_explosion()
+            if explosion == None:
+                continue
+
+            # take an image from the pool
+            if bullet not in self.effects:
+                if len(self.freeEffects) == 0:
+                    self.freeEffects.append(self.canvas.create_image(0, 0, state="hidden", tags="dynamic"))
+                self.effects[bullet] = [self.freeEffects.pop(), None, None]
+            effect = self.effects[bullet]
+
+            pos, radius, color = explosion
+            if (color, radius) != effect[1]:
+                effect[1] = color, radius
+                self.canvas.itemconfigure(effect[0], image=self.get_explosion_image(color, radius), state="normal")
+                self.numChanged += 1
+            if pos != effect[2]:
+                effect[2] = pos
+                self.canvas.coords(effect[0], pos[0]*self.scale, -pos[1]*self.scale)
+                self.numChanged += 1
+
+    def draw_shields(self):
+        '''GameRenderer.draw_shields() -> None
+        paints the new holes into the shield images'''
+        for shield, image, drawn in zip(self.game.get_shields(), self.shieldImages, self.shieldDrawn):
+            # shield was filled back in
+            if shield.get_num_resets() != drawn[0]:
+                image.put(shield.color, to=(0, 0, image.width(), image.height()))
+                drawn[0] = shield.get_num_resets()
+                drawn[1] = 0
+                self.numChanged += 1
+
+            changes = shield.get_changes()
+            size = shield.cellSize*self.scale
+            for row, first, last in changes[drawn[1]:]:
+                image.put("black", to=(round(first*size), round(row*size), min(round((last+1)*size), image.width()),
+                    min(round((row+1)*size), image.height())))
+                self.numChanged += 1
+            drawn[1] = len(changes)
+
+    def draw_text(self):
+        '''GameRenderer.draw_text() -> None
+        updates the stats and the messages'''
+        self.numChanged += self.hud.update()
+
+        # game over
+        if self.game.is_ended() and self.gameOverText == None:
+            self.gameOverText = self.canvas.create_text(0,0, text="Game Over!", fill="white",
+                font=self.viewport.scale_font(("Arial", 100)),
+                tags="overlay")
+
+        # new level
+        if self.game.is_changing_level() and self.levelText == None:
+            self.levelText = self.canvas.create_text(0,0, text="Level " + str(self.game.get_level()),
+                font=self.viewport.scale_font(("Arial", 100)), fill="White",
+                tags="overlay")
+        elif not self.game.is_changing_level() and self.levelText != None:
+            self.canvas.delete(self.levelText)
+            self.levelText = None
+
+class Sprite:
+    '''an image ready to be copied into a Framebuffer, kept as the runs of opaque pixels of each row'''
+
+    def __init__(self, width, height, pixels, originX=None, originY=None):
+        '''Sprite(width, height, pixels, originX=None, originY=None) -> Sprite
+        the sprite of RGBA pixels, which is drawn with (originX, originY),
+        by default its middle, at the position it is drawn at'''
+        self.width = width
+        self.height = height
+        self.originX = width/2 if originX == None else originX
+        self.originY = height/2 if originY == None else originY
+        self.runs = [] # row -> [(first column, RGB bytes)]
+        for y in range(height):
+            runs = []
+            x = 0
+            while x < width:
+                if pixels[(y*width+x)*4+3] < 128:
+                    x += 1
+                    continue
+                first = x
+                while x < width and pixels[(y*width+x)*4+3] >= 128:
+                    x += 1
+                runs.append((first, bytes(pixels[start+index] for start in range((y*width+first)*4,
+                    (y*width+x)*4, 4) for index in range(3))))
+            self.runs.append(runs)
+
+    def get_box(self, x, y):
+        '''Sprite.get_box(x, y) -> tuple
+        returns the left, top, right and bottom pixels covered when drawn at (x,y)'''
+        left = round(x - self.originX)
+        top = round(y - self.originY)
+        return left, top, left+self.width, top+self.height
+
+class Framebuffer:
+    '''an RGB image in memory to draw frames into without a display'''
+
+    def __init__(self, width, height):
+        '''Framebuffer(width, height) -> Framebuffer
+        a black width x height image'''
+        self.width = width
+        self.height = height
+        self.pixels = bytearray(width*height*3)
+
+    def get_size(self):
+        '''Framebuffer.get_size() -> int, int
+        returns the width and height in pixels'''
+        return self.width, self.height
+
+    def get_pixels(self):
+        '''Framebuffer.get_pixels() -> bytearray
+        returns the RGB pixels row by row from the top'''
+        return self.pixels
+
+    def clip(self, box):
+        '''Framebuffer.clip(box) -> tuple
+        returns the part of box (left, top, right, bottom) inside the image, or None'''
+        left, top, right, bottom = max(box[0], 0), max(box[1], 0), min(box[2], self.width), min(box[3], self.height)
+        if left >= right or top >= bottom:
+            return None
+        return left, top, right, bottom
+
+    def fill(self, box, rgb):
+        '''Framebuffer.fill(box, rgb) -> None
+        paints box (left, top, right, bottom) with color rgb'''
+        box = self.clip(box)
+        if box == None:
+            return
+        left, top, right, bottom = box
+        line = bytes(rgb)*(right-left)
+        for y in range(top, bottom):
+            self.pixels[(y*self.width+left)*3:(y*self.width+right)*3] = line
+
+    def copy(self, source, box):
+        '''Framebuffer.copy(source, box) -> None
+        copies box (left, top, right, bottom) from the Framebuffer source of the same size'''
+        box = self.clip(box)
+        if box == None:
+            return
+        left, top, right, bottom = box
+        for y in range(top, bottom):
+            start = (y*self.width+left)*3
+            end = (y*self.width+right)*3
+            self.pixels[start:end] = source.pixels[start:end]
+
+    def blit(self, sprite, left, top, box=None):
+        '''Framebuffer.blit(sprite, left, top, box=None) -> None
+        draws sprite with its top left corner at (left, top), only inside box if given'''
+        box = self.clip(box or (left, top, left+sprite.width, top+sprite.height))
+        if box == None:
+            return
+        clipLeft, clipTop, clipRight, clipBottom = box
+        for y in range(max(clipTop, top), min(clipBottom, top+sprite.height)):
+            start = y*self.width*3
+            for first, data in sprite.runs[y-top]:
+                first += left
+                last = first + len(data)//3
+                if first >= clipLeft and last <= clipRight:
+                    self.pixels[start+first*3:start+last*3] = data
+                elif first < clipRight and last > clipLeft:
+                    fromX, toX = max(first, clipLeft), min(last, clipRight)
+                    self.pixels[start+fromX*3:start+toX*3] = data[(fromX-first)*3:(toX-first)*3]
+
+    def encode(self, kind="png"):
+        '''Framebuffer.encode(kind="png") -> bytes
+        returns the image as a "png" or "ppm" file'''
+        if kind == "ppm":
+            return "P6\n{} {}\n255\n".format(self.width, self.height).encode() + bytes(self.pixels)
+        return encode_png(self.width, self.height, self.pixels, False)
+
+class FramebufferRenderer:
+    '''draws a game into a Framebuffer the way GameRenderer draws it on a canvas
+
+    the black field and shields are kept in a background image, and every other
+    thing is a sprite drawn on top, so each frame only the boxes of sprites that
+    moved, changed or went away are copied back from the background and redrawn'''
+
+    def __init__(self, game, assets, viewport=None, name=""):
+        '''FramebufferRenderer(game, assets, viewport=None, name="") -> FramebufferRenderer
+        sets up the sprites for game from the pixels of assets
+        viewport gives the size of the image, by default one pixel per world unit
+        name is the player's name for the stats, or "" to play anonymously'''
+        if viewport == None:
+            viewport = Viewport(game.get_width(), game.get_height())
+        self.viewport = viewport
+        scale = self.scale = viewport.get_scale()
+        self.game = game
+        self.name = name
+        width, height = viewport.get_size()
+        self.frame = Framebuffer(width, height)
+        self.background = Framebuffer(width, height)
+        self.drawn = {} # key -> (sprite, x, y) of everything drawn on the background
+        self.boxes = {} # key -> (left, top, right, bottom) of the drawn sprites
+        self.dirty = [(0, 0, width, height)] # boxes to redraw in the next frame
+        self.numChanged = 0
+
+        # sprites of the assets scaled to the viewport
+        self.sprites = {}
+        for key in assets.files:
+            spriteWidth, spriteHeight, pixels = assets.get_pixels(key)
+            newWidth = max(round(spriteWidth*scale), 1)
+            newHeight = max(round(spriteHeight*scale), 1)
+            self.sprites[key] = Sprite(newWidth, newHeight, scale_pixels(spriteWidth, spriteHeight, pixels,
+                newWidth, newHeight))
+        self.texts = {} # (text, size) -> Sprite
+        self.bulletSprites = {} # (color, dx, dy) -> Sprite
+        self.explosionSprites = {} # (color, radius) -> Sprite
+
+        # stats along the top, like Hud
+        self.hudSize = max(round(17*scale/10), 1)
+        self.hudY = viewport.to_screen(0, game.get_height()/2-30)[1] + height/2
+        stats = Hud.stats if name != "" else Hud.stats[:3]
+        numItems = len(stats) + (name != "")
+        self.hudXs = [width/2 + (index-(numItems-1)/2)*190*scale for index in range(numItems)]
+        self.hudStats = [(label, getattr(game, method)) for label, method in stats]
+
+        self.shieldDrawn = [[None, 0] for shield in game.get_shields()] # resets and changes drawn
+
+    def get_frame(self):
+        '''FramebufferRenderer.get_frame() -> Framebuffer
+        returns the image drawn into'''
+        return self.frame
+
+    def get_num_changed(self):
+        '''FramebufferRenderer.get_num_changed() -> int
+        returns the number of sprites and shield strips changed by the last draw'''
+        return self.numChanged
+
+    def get_num_items(self):
+        '''FramebufferRenderer.get_num_items() -> int
+        returns the number of sprites drawn'''
+        return len(self.drawn)
+
+    def to_screen(self, x, y):
+        '''FramebufferRenderer.to_screen(x, y) -> float, float
+        returns the pixel of world position (x,y), from the top left of the image'''
+        x, y = self.viewport.to_screen(x, y)
+        return x + self.frame.width/2, y + self.frame.height/2
+
+    def get_rgb(self, color):
+        '''FramebufferRenderer.get_rgb(color) -> tuple
+        returns the rgb of a color name in COLORS or of a "#rrggbb" color
+        raises ValueError for other colors, which need tkinter to look up'''
+        if color in COLORS:
+            return COLORS[color]
+        if len(color) == 7 and color[0] == "#":
+            try:
+                return tuple(int(color[index:index+2], 16) for index in range(1, 7, 2))
+            except ValueError:
+                pass
+        raise ValueError("unknown color " + color)
+
+    def get_text(self, text, size):
+        '''FramebufferRenderer.get_text(text, size) -> Sprite
+        returns a white sprite of text, drawing it if needed'''
+        if (text, size) not in self.texts:
+            # old scores are not needed again
+            if len(self.texts) > 256:
+                self.texts.clear()
+            self.texts[text, size] = Sprite(*draw_text(text, size, COLORS["white"]))
+        return self.texts[text, size]
+
+    def get_bullet(self, bullet):
+        '''FramebufferRenderer.get_bullet(bullet) -> Sprite
+        returns the thin triangle GameRenderer draws for bullet, drawing it if needed'''
+        key = bullet.get_color(), bullet.dx, bullet.dy
+        if key not in self.bulletSprites:
+            dx, dy = bullet.dx*self.scale, bullet.dy*self.scale
+            corners = [(8.1*dx, -8.1*dy), (-4*dx-2*dy, -4*dy+2*dx), (-4*dx+2*dy, -4*dy-2*dx)]
+            left = math.floor(min(corner[0] for corner in corners))
+            top = math.floor(min(corner[1] for corner in corners))
+            width = math.ceil(max(corner[0] for corner in corners)) - left + 1
+            height = math.ceil(max(corner[1] for corner in corners)) - top + 1
+            pixels = bytearray(width*height*4)
+            color = bytes(self.get_rgb(bullet.get_color())) + b"\xff"
+            for y in range(height):
+                for x in range(width):
+                    # inside if the middle of the pixel is on the same side of every edge
+                    px, py = left + x + 0.5, top + y + 0.5
+                    sides = [(bx-ax)*(py-ay) - (by-ay)*(px-ax) for (ax, ay), (bx, by) in
+                        zip(corners, corners[1:] + corners[:1])]
+                    if min(sides) >= 0 or max(sides) <= 0:
+                        pixels[(y*width+x)*4:(y*width+x)*4+4] = color
+            self.bulletSprites[key] = Sprite(width, height, pixels, -left, -top)
+        return self.bulletSprites[key]
+
+    def get_explosion(self, color, radius):
+        '''FramebufferRenderer.get_explosion(color, radius) -> Sprite
+        returns a ring of an explosion, drawing it if needed'''
+        if (color, radius) not in self.explosionSprites:
+            size, pixels = draw_ring(radius*self.scale, 5*self.scale, self.get_rgb(color))
+            self.explosionSprites[color, radius] = Sprite(size, size, pixels)
+        return self.explosionSprites[color, radius]
+
+    def draw(self):
+        '''FramebufferRenderer.draw() -> None
+        brings the image up to date with the game'''
+        self.numChanged = 0
+        self.draw_shields()
+
+        # everything in front of the background, back to front
+        sprites = {}
+        self.add_stats(sprites)
+        spaceship = self.game.get_spaceship()
+        if spaceship.isvisible():
+            self.add_sprite(sprites, "spaceship", self.sprites["spaceship"], *spaceship.pos())
+        bullets = self.game.get_bullets()
+        for index, bullet in enumerate(bullets):
+            if bullet.isvisible():
+                self.add_sprite(sprites, ("bullet", index), self.get_bullet(bullet), *bullet.pos())
+        player = self.game.get_player()
+        self.add_sprite(sprites, "player", self.sprites["broken player" if player.is_broken() else "player"],
+            *player.pos())
+        aliens = self.game.get_aliens()
+        x,y = aliens.get_pos()
+        frame = aliens.get_frame()
+        for cell in aliens.get_cells():
+            (alienX, alienY), alienNum = aliens.get_alien(cell)
+            self.add_sprite(sprites, ("alien", cell), self.sprites[alienNum, frame], alienX+x, alienY+y)
+        for index, bullet in enumerate(bullets):
+            explosion = bullet.get_explosion()
+            if explosion != None:
+                pos, radius, color = explosion
+                self.add_sprite(sprites, ("explosion", index), self.get_explosion(color, radius), *pos)
+        self.add_messages(sprites)
+
+        # boxes of whatever changed, before and after, as one box if they overlap
+        boxes = {}
+        for key, placed in sprites.items():
+            boxes[key] = box = placed[0].get_box(*placed[1:])
+            if self.drawn.get(key) == placed:
+                continue
+            self.numChanged += 1
+            if key in self.boxes:
+                old = self.boxes[key]
+                if old[0] < box[2] and old[2] > box[0] and old[1] < box[3] and old[3] > box[1]:
+                    box = min(old[0], box[0]), min(old[1], box[1]), max(old[2], box[2]), max(old[3], box[3])
+                else:
+                    self.dirty.append(old)
+            self.dirty.append(box)
+        for key in self.drawn:
+            if key not in sprites:
+                self.dirty.append(self.boxes[key])
+                self.numChanged += 1
+        self.drawn = sprites
+        self.boxes = boxes
+
+        # redraw the boxes from the background up
+        for box in self.dirty:
+            box = self.frame.clip(box)
+            if box == None:
+                continue
+            self.frame.copy(self.background, box)
+            for key, (left, top, right, bottom) in boxes.items():
+                if left < box[2] and right > box[0] and top < box[3] and bottom > box[1]:
+                    self.frame.blit(sprites[key][0], left, top, box)
+        self.dirty = []
+
+    def add_sprite(self, sprites, key, sprite, x, y):
+        '''FramebufferRenderer.add_sprite(sprites, key, sprite, x, y) -> None
+        puts sprite at world position (x,y) in sprites as key'''
+        sprites[key] = (sprite,) + self.to_screen(x, y)
+
+    def add_stats(self, sprites):
+        '''FramebufferRenderer.add_stats(sprites) -> None
+        puts a sprite for the name and each stat in sprites'''
+        texts = [label + str(getter()) for label, getter in self.hudStats]
+        if self.name != "":
+            texts.insert(0, self.name)
+        for index, (text, x) in enumerate(zip(texts, self.hudXs)):
+            sprites["hud", index] = (self.get_text(text, self.hudSize), x, self.hudY)
+
+    def add_messages(self, sprites):
+        '''FramebufferRenderer.add_messages(sprites) -> None
+        puts the game over or new level message in the middle of sprites'''
+        size = max(round(100*self.scale/10), 1)
+        if self.game.is_ended():
+            sprites["message"] = (self.get_text("Game Over!", size),) + self.to_screen(0, 0)
+        elif self.game.is_changing_level():
+            sprites["message"] = (self.get_text("Level " + str(self.game.get_level()), size),) + self.to_screen(0, 0)
+
+    def draw_shields(self):
+        '''FramebufferRenderer.draw_shields() -> None
+        paints the shields and their new holes into the background'''
+        for shield, drawn in zip(self.game.get_shields(), self.shieldDrawn):
+            width = round(shield.width*self.scale)
+            height = round(shield.height*self.scale)
+            x,y = self.to_screen(shield.x, shield.y)
+            left = round(x - width/2)
+            top = round(y - height/2)
+
+            # shield was filled back in
+            if shield.get_num_resets() != drawn[0]:
+                box = left, top, left+width, top+height
+                self.background.fill(box, self.get_rgb(shield.color))
+                self.dirty.append(box)
+                drawn[0] = shield.get_num_resets()
+                drawn[1] = 0
+                self.numChanged += 1
+
+            changes = shield.get_changes()
+            size = shield.cellSize*self.scale
+            for row, first, last in changes[drawn[1]:]:
+                box = (left+round(first*size), top+round(row*size), left+min(round((last+1)*size), width),
+                    top+min(round((row+1)*size), height))
+                self.background.fill(box, COLORS["black"])
+                self.dirty.append(box)
+                self.numChanged += 1
+            drawn[1] = len(changes)
+
+class FrameWriter:
+    '''draws a game into a framebuffer at a steady rate of game time and saves the frames
+    as numbered images in a folder or as raw RGB video to a stream'''
+
+    def __init__(self, fps=30, folder=None, stream=None, kind="png", size=None, name=""):
+        '''FrameWriter(fps=30, folder=None, stream=None, kind="png", size=None, name="") -> FrameWriter
+        saves fps frames per second of game time, as "png" or "ppm" files in folder,
+        or one after another to the binary stream (like a pipe to ffmpeg) if folder is None
+        size is the width and height of the frames, by default the size of the field'''
+        self.fps = fps
+        self.folder = folder
+        self.stream = stream
+        self.kind = kind
+        self.size = size
+        self.name = name
+        self.renderer = None
+        self.numFrames = 0
+        self.nextTime = 0
+        if folder != None:
+            os.makedirs(folder, exist_ok=True)
+
+    def start(self, game):
+        '''FrameWriter.start(game) -> None
+        starts drawing game, which has not ticked yet'''
+        size = self.size or (game.get_width(), game.get_height())
+        self.renderer = FramebufferRenderer(game, game.get_assets(),
+            Viewport(game.get_width(), game.get_height(), *size), self.name)
+        self.nextTime = game.get_time()
+
+    def get_renderer(self):
+        '''FrameWriter.get_renderer() -> FramebufferRenderer
+        returns the renderer of the game being drawn'''
+        return self.renderer
+
+    def get_num_frames(self):
+        '''FrameWriter.get_num_frames() -> int
+        returns the number of frames saved'''
+        return self.numFrames
+
+    def update(self, game):
+        '''FrameWriter.update(game) -> None
+        draws and saves a frame if one is due at the game's time'''
+        if game.get_time() < self.nextTime:
+            return
+        self.renderer.draw()
+        while self.nextTime <= game.get_time():
+            self.write()
+            self.nextTime += 1/self.fps
+
+    def finish(self, seconds=2):
+        '''FrameWriter.finish(seconds=2) -> None
+        draws the last state of the game and holds it for seconds'''
+        self.renderer.draw()
+        for frame in range(round(seconds*self.fps)):
+            self.write()
+        if self.stream != None:
+            self.stream.flush()
+
+    def write(self):
+        '''FrameWriter.write() -> None
+        saves the frame drawn last'''
+        frame = self.renderer.get_frame()
+        if self.folder == None:
+            self.stream.write(frame.get_pixels())
+        else:
+            file = open(os.path.join(self.folder, "frame_{:06d}.{}".format(self.numFrames, self.kind)), "wb")
+            file.write(frame.encode(self.kind))
+            file.close()
+        self.numFrames += 1
+
+class SpaceInvadersFrame(Frame):
+    '''the frame for space invaders'''
+
+    def __init__(self, master, numLives=5, seed=None, replay=None, recordFile=None, clock=time.perf_counter,
+                 profile=False, size=None, field=None):
+        '''SpaceInvadersFrame(master, numLives=5, seed=None, replay=None, recordFile=None, clock=time.perf_counter,
+        profile=False, size=None, field=None) -> SpaceInvadersFrame
+        sets up the frame and game data
+        replay is a Replay to watch instead of playing, recordFile is where to save
+        a replay of the game and clock is the real time in seconds
+        profile turns on the profiler, which F3 also toggles
+        size is the (width, height) of the window, by default the size of the field
+        field is the (width, height) of the field, by default the level file's'''
+        # enter game
+        self.waiting = StringVar(value="waiting")
+        self.master = master
+        self.replay = replay
+        self.recordFile = recordFile
+        self.clock = clock
+
+        # one worker thread does the disk work in order, and hands back
+        # what it finds through a queue that the Tk loop checks
+        self.worker = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        self.results = queue.Queue()
+        self.pollTime = 50 # milliseconds between checks of the queue
+        self.poll_results()
+
+        self.scores = ScoreStore()
+        self.run_in_background(self.scores.create)
+        self.run_in_background(self.scores.import_text_files)
+        if replay == None:
+            self.name_input()
+        else:
+            self.nameVar = StringVar()
+            self.clearHigh = IntVar()
+            numLives = replay.get_num_lives()
+            seed = replay.get_seed()
+
+        # game, and the view of its field
+        self.assets = Assets(clock=clock)
+        if replay == None:
+            self.game = Game(*(field or ()), numLives=numLives, seed=seed, assets=self.assets)
+        else:
+            replay.check(load_levels())
+            self.game = Game(*replay.get_size(), numLives=numLives, seed=seed, assets=self.assets)
+        if size == None:
+            size = self.game.get_width(), self.game.get_height()
+        self.viewport = Viewport(self.game.get_width(), self.game.get_height(), *size)
+        master.geometry("{}x{}+100+50".format(*size))
+
+        Frame.__init__(self, master)
+        self.grid()
+
+        # canvas, with (0,0) in the middle and y going down
+        self.canvas = self.viewport.make_canvas(self)
+        self.canvas.grid(row=0, column=0)
+
+        # drawing
+        self.load_high_score()
+        self.renderer = GameRenderer(self.game, self.canvas, self.nameVar.get(), self.assets, self.viewport)
+        self.scoreSaved = False
+        self.replaySaved = False
+
+        # key bindings
+        self.keyActions = {"space": "shoot", "Up": "shoot", "Left": "left", "Right": "right"}
+        self.heldKeys = set()
+        self.releasedKeys = set()
+        self.heldActions = dict.fromkeys(Controls.keys, False)
+        if replay == None:
+            for key in self.keyActions:
+                self.canvas.bind_all("<KeyPress-"+key+">",self.key_down)
+                self.canvas.bind_all("<KeyRelease-"+key+">",self.key_up)
+        self.canvas.bind_all("<F3>",self.toggle_profiler)
+
+        # profiler, shown under the stats
+        self.profiler = Profiler(clock=clock)
+        self.profileText = self.canvas.create_text(10-size[0]/2, 50-size[1]/2, anchor="nw", text="",
+            font=("Courier", 10), fill="white", state="hidden", tags="overlay")
+        self.numFrames = 0
+        if profile:
+            self.toggle_profiler()
+
+        # game loop: run the game ticks for the real time passed, then draw once
+        self.frameTime = 16 # milliseconds between rendered frames
+        self.maxLag = 250 # most game time to catch up on in one frame
+        self.lag = 0
+        self.lastFrame = self.clock()
+        self.run_frame()
+
+    def get_canvas(self):
+        '''SpaceInvadersFrame.get_canvas() -> Canvas
+        returns the current tkinter canvas used for the game'''
+        return self.canvas
+
+    def get_game(self):
+        '''SpaceInvadersFrame.get_game() -> Game
+        returns the game being played'''
+        return self.game
+
+    def run_frame(self):
+        '''SpaceInvadersFrame.run_frame() -> None
+        runs the ticks for the real time that has passed and draws one frame'''
+        profiler = self.game.get_profiler()
+        if profiler != None:
+            profiler.start_frame()
+
+        # keys let go of since the last frame, unless pressed again by key repeat
+        for key in self.releasedKeys:
+            self.heldKeys.discard(key)
+            self.update_action(self.keyActions[key])
+        self.releasedKeys.clear()
+
+        now = self.clock()
+        self.lag = min(self.lag + (now-self.lastFrame)*1000, self.maxLag)
+        self.lastFrame = now
+
+        while self.lag >= self.game.tickTime:
+            if self.replay != None:
+                self.replay.feed(self.game)
+            self.game.tick()
+            self.lag -= self.game.tickTime
+
+        # save the score and the replay once the game is lost
+        if self.game.is_ended() and not self.scoreSaved:
+            self.scoreSaved = True
+            self.save_high_score()
+            if self.recordFile != None:
+                # the worker only gets the bytes, not the replay the Tk thread owns
+                self.replaySaved = True
+                self.run_in_background(write_file, self.recordFile, self.game.get_replay().to_bytes())
+
+        if profiler == None:
+            self.renderer.draw()
+            self.canvas.update_idletasks()
+        else:
+            profiler.time_call("draw", self.renderer.draw)
+            profiler.time_call("update", self.canvas.update_idletasks)
+            profiler.end_frame(self.frameTime, len(self.canvas.find_all()))
+
+            # refresh the numbers a few times a second
+            self.numFrames += 1
+            if self.numFrames % 15 == 0:
+                self.canvas.itemconfigure(self.profileText, text=profiler.get_text())
+
+        self.after(self.frameTime, self.run_frame)
+
+    def run_in_background(self, function, *args, callback=None):
+        '''SpaceInvadersFrame.run_in_background(function, *args, callback=None) -> Future
+        calls function(*args) on the worker thread, then callback(result) on the Tk thread'''
+        def work():
+            try:
+                self.results.put((callback, function(*args), None))
+            except Exception as error:
+                self.results.put((callback, None, error))
+        return self.worker.submit(work)
+
+    def poll_results(self):
+        '''SpaceInvadersFrame.poll_results() -> None
+        hands the results of finished background work to their callbacks'''
+        while True:
+            try:
+                callback, result, error = self.results.get_nowait()
+            except queue.Empty:
+                break
+            if error != None:
+                print("space invaders:", repr(error), file=sys.stderr)
+            elif callback != None:
+                callback(result)
+        self.master.after(self.pollTime, self.poll_results)
+
+    def close(self):
+        '''SpaceInvadersFrame.close() -> None
+        waits for the background work to finish, and saves the replay
+        of a game left before it was lost'''
+        self.worker.shutdown(wait=True)
+        if self.recordFile != None and not self.replaySaved:
+            self.replaySaved = True
+            self.game.get_replay().save(self.recordFile)
+
+    def get_assets(self):
+        '''SpaceInvadersFrame.get_assets() -> Assets
+        returns the sprites of the game'''
+        return self.assets
+
+    def get_profiler(self):
+        '''SpaceInvadersFrame.get_profiler() -> Profiler
+        returns the profiler of the frame'''
+        return self.profiler
+
+    def toggle_profiler(self, event=''):
+        '''SpaceInvadersFrame.toggle_profiler(event='') -> None
+        turns the profiler and its numbers on or off'''
+        if self.game.get_profiler() == None:
+            self.game.set_profiler(self.profiler)
+            self.canvas.itemconfigure(self.profileText, state="normal")
+        else:
+            self.game.set_profiler(None)
+            self.canvas.itemconfigure(self.profileText, state="hidden")
+
+    def key_down(self, event):
+        '''SpaceInvadersFrame.key_down(event) -> None
+        holds down the key of event'''
+        # key repeat lets go and presses again straight away
+        if event.keysym in self.releasedKeys:
+            self.releasedKeys.discard(event.keysym)
+            return
+
+        self.heldKeys.add(event.keysym)
+        self.update_action(self.keyActions[event.keysym])
+
+    def key_up(self, event):
+        '''SpaceInvadersFrame.key_up(event) -> None
+        lets go of the key of event at the next frame'''
+        if event.keysym in self.heldKeys:
+            self.releasedKeys.add(event.keysym)
+
+    def update_action(self, action):
+        '''SpaceInvadersFrame.update_action(action) -> None
+        tells the game if action is held down by any of its keys'''
+        held = any(self.keyActions[key] == action for key in self.heldKeys)
+        if held != self.heldActions[action]:
+            self.heldActions[action] = held
+            self.game.press(action + (" down" if held else " up"))
 
     def name_input(self):
         '''name_input() -> str
         returns the player's name'''
         window = Frame(self.master)
         window.grid()
-        
+
         # buttons and text area
         Label(window, text="Enter your name:").grid(row=1, column=0, sticky=W)
         Label(window, text="(Leave blank to play anonymously)", font=("Arial", 7, "italic")).grid(row=0, column=0, sticky=W)
@@ -706,48 +3806,637 @@ class SpaceInvadersFrame(Frame):
         Checkbutton(window, text="Clear high score", variable=self.clearHigh).grid(row=5, column=0, sticky=W)
         Canvas(window, height=5, width=10).grid(row=2, column=0)
         window.bind_all("<Return>", self.enter_game)
-        
+
+        # leaderboard, filled in once the worker has read it
+        self.leaderboard = Frame(window)
+        self.leaderboard.grid(row=6, column=0, sticky=W)
+        self.run_in_background(self.scores.get_leaderboard, callback=self.show_leaderboard)
+
         self.master.wait_variable(self.waiting)
         window.destroy()
 
+    def show_leaderboard(self, leaders):
+        '''SpaceInvadersFrame.show_leaderboard(leaders) -> None
+        lists the best players on the name screen'''
+        if not self.leaderboard.winfo_exists():
+            return
+        if len(leaders) != 0:
+            Label(self.leaderboard, text="High Scores", font=("Arial", 10, "bold")).grid(row=0, column=0, sticky=W)
+        for place, (name, score, level, when) in enumerate(leaders):
+            Label(self.leaderboard, text="{}. {}  {}{}".format(place+1, name, score, "  (level "+str(level)+")" if level > 0 else ""),
+                font=("Courier", 9)).grid(row=place+1, column=0, sticky=W)
+
     def enter_game(self, event=''):
         '''SpaceInvadersFrame.enter_game(event='') -> None
         enters the game'''
         if len(self.nameVar.get()) > 15:
             message.showerror(title="Error 3406", message="The name you have entered is too long.")
             return
-        
+
         self.waiting.set("enter")
 
-    def get_high_score(self):
-        '''SpaceInvadersFrame.get_high_score() -> int
-        returns the total high score'''
-        fileName = "space_invaders_"+self.nameVar.get().lower()+".txt"
-        
-        if self.nameVar.get() == "" or not os.path.isfile(fileName) or self.clearHigh.get() == 1:
-            return 0
+    def load_high_score(self):
+        '''SpaceInvadersFrame.load_high_score() -> None
+        gives the game the high score of the player once it is read,
+        clearing it first if asked to'''
+        if self.nameVar.get() == "":
+            return
+        if self.clearHigh.get() == 1:
+            self.run_in_background(self.scores.clear, self.nameVar.get())
+            return
+        self.run_in_background(self.scores.get_high_score, self.nameVar.get(), callback=self.game.set_high_score)
 
-        # get score from file
-        file = open(fileName)
-        highScore = int(file.read().split()[-1])
-        file.close()
-        return highScore
-        
     def save_high_score(self):
         '''SpaceInvadersFrame.save_high_score() -> None
-        saves the proper file'''
+        saves the score of the game in the background'''
         if self.nameVar.get() == "":
             return
+        self.run_in_background(self.scores.add_score, self.nameVar.get(), self.game.get_score(), self.game.get_level())
+
+def autopilot(game, rand):
+    '''autopilot(game, rand) -> None
+    a simple bot that dodges around and shoots as often as it can
+    rand is the Random it makes its choices with'''
+    controls = game.get_controls()
+    move = rand.choice(("left", "right", None))
+    for key in ("left", "right"):
+        if controls.is_held(key) and key != move:
+            game.press(key+" up")
+        elif not controls.is_held(key) and key == move:
+            game.press(key+" down")
+    if not controls.is_held("shoot"):
+        game.press("shoot down")
+
+def run_headless(maxTicks=1000000, numLives=5, botWait=50, seed=None, replay=None, writer=None, field=None):
+    '''run_headless(maxTicks=1000000, numLives=5, botWait=50, seed=None, replay=None, writer=None, field=None) -> dict, Game
+    plays a game without a display as fast as possible, letting the bot
+    act every botWait milliseconds of game time, or playing back replay.
+    field is the (width, height) of the field, by default the level file's,
+    and a replay is played on the field it was recorded on.
+    If writer is a FrameWriter the game is also drawn into its frames.
+    Returns the results and the game
+    raises ValueError if replay was recorded with other levels'''
+    if replay != None:
+        replay.check(load_levels())
+        game = Game(*replay.get_size(), numLives=replay.get_num_lives(), seed=replay.get_seed())
+    else:
+        game = Game(*(field or ()), numLives=numLives, seed=seed)
+    rand = random.Random(game.get_seed())
+    botTicks = max(botWait//game.tickTime, 1)
+    start = time.perf_counter()
+    if writer != None:
+        writer.start(game)
+
+    while game.get_num_ticks() < maxTicks and not game.is_ended():
+        # the next tick anyone gives an input on
+        if replay != None:
+            replay.feed(game)
+            nextInput = replay.get_next_tick()
+            if nextInput == None:
+                nextInput = maxTicks
+        else:
+            if game.get_num_ticks() % botTicks == 0:
+                autopilot(game, rand)
+            nextInput = (game.get_num_ticks()//botTicks + 1)*botTicks
+
+        if writer != None:
+            game.tick()
+            writer.update(game)
+        else:
+            game.advance(min(max(nextInput, game.get_num_ticks()+1), maxTicks))
+    if writer != None:
+        writer.finish()
+
+    realTime = time.perf_counter() - start
+    results = {"seed": game.get_seed(), "ticks": game.get_num_ticks(), "gameTime": game.get_time(),
+        "realTime": realTime, "speedup": game.get_time()/max(realTime, 1e-9), "level": game.get_level(),
+        "score": game.get_score(), "ended": game.is_ended()}
+    if writer != None:
+        results["frames"] = writer.get_num_frames()
+    return results, game
+
+class SpaceInvadersEnv:
+    '''a gym-style environment: one game a bot plays by choosing an action every step'''
+
+    # the keys held down for each action
+    actions = ((), ("left",), ("right",), ("shoot",), ("left", "shoot"), ("right", "shoot"))
+
+    def __init__(self, frameSkip=4, maxTicks=None, numLives=5, levels=None):
+        '''SpaceInvadersEnv(frameSkip=4, maxTicks=None, numLives=5, levels=None) -> SpaceInvadersEnv
+        an environment whose every step runs frameSkip game ticks with the same keys held,
+        stopping a game after maxTicks ticks if it has not ended by then
+        levels is the LevelConfig to play, levels.json by default'''
+        self.frameSkip = frameSkip
+        self.maxTicks = maxTicks
+        self.numLives = numLives
+        self.levels = levels
+        self.game = None
+
+    def reset(self, seed=None):
+        '''SpaceInvadersEnv.reset(seed=None) -> list
+        starts a new game from seed and returns the first observation'''
+        self.game = Game(numLives=self.numLives, seed=seed, levels=self.levels)
+        return self.get_observation()
+
+    def get_game(self):
+        '''SpaceInvadersEnv.get_game() -> Game
+        returns the game being played'''
+        return self.game
+
+    def get_num_actions(self):
+        '''SpaceInvadersEnv.get_num_actions() -> int
+        returns the number of actions step takes'''
+        return len(self.actions)
+
+    def step(self, action):
+        '''SpaceInvadersEnv.step(action) -> list, int, bool, dict
+        holds the keys of action (an index into actions) for frameSkip ticks and returns
+        the observation, the score gained, if the game is done and information about it'''
+        game = self.game
+        controls = game.get_controls()
+        held = self.actions[action]
+        for key in Controls.keys:
+            if controls.is_held(key) != (key in held):
+                game.press(key + (" down" if key in held else " up"))
+
+        score = game.get_score()
+        lives = game.get_lives()
+        game.advance(game.get_num_ticks() + self.frameSkip)
+
+        truncated = self.maxTicks != None and game.get_num_ticks() >= self.maxTicks
+        info = {"level": game.get_level(), "lives": game.get_lives(), "score": game.get_score(),
+            "ticks": game.get_num_ticks(), "livesLost": lives-game.get_lives(), "truncated": truncated}
+        return self.get_observation(), game.get_score()-score, game.is_ended() or truncated, info
 
-        # save score
-        file = open("space_invaders_"+self.nameVar.get().lower()+".txt","w")
-        file.write(" "+str(self.highScore))
+    def get_observation(self):
+        '''SpaceInvadersEnv.get_observation() -> list
+        returns the state of the game as a flat list of numbers, with positions
+        divided by half the size of the field:
+        player x, lives, level, if the level is changing, formation x and y and direction,
+        every alien cell (1 if alive), x, y and if moving for every bullet,
+        spaceship x and if visible and the part of each shield left'''
+        game = self.game
+        halfWidth = game.get_width()/2
+        halfHeight = game.get_height()/2
+        aliens = game.get_aliens()
+        x,y = aliens.get_pos()
+
+        observation = [game.get_player().xcor()/halfWidth, game.get_lives(), game.get_level(),
+            int(game.is_changing_level()), x/halfWidth, y/halfHeight, aliens.direction]
+        observation.extend(aliens.alive)
+        for bullet in game.get_bullets():
+            observation.extend((bullet.x/halfWidth, bullet.y/halfHeight, int(bullet.is_moving())))
+
+        spaceship = game.get_spaceship()
+        observation.extend((spaceship.xcor()/halfWidth, int(spaceship.isvisible())))
+        for shield in game.get_shields():
+            cells = shield.get_cells()
+            observation.append(cells.count(1)/len(cells))
+        return observation
+
+class VectorEnv:
+    '''many SpaceInvadersEnv games stepped together'''
+
+    def __init__(self, numEnvs, seed=None, **options):
+        '''VectorEnv(numEnvs, seed=None, **options) -> VectorEnv
+        numEnvs environments made with options (see SpaceInvadersEnv)
+        the seeds of their games all come from seed'''
+        self.envs = [SpaceInvadersEnv(**options) for i in range(numEnvs)]
+        self.random = random.Random(seed)
+
+    def __len__(self):
+        '''len(VectorEnv) -> int
+        returns the number of environments'''
+        return len(self.envs)
+
+    def get_envs(self):
+        '''VectorEnv.get_envs() -> list
+        returns the environments'''
+        return self.envs
+
+    def reset(self):
+        '''VectorEnv.reset() -> list
+        starts a new game in every environment and returns their observations'''
+        return [env.reset(self.random.randrange(2**63)) for env in self.envs]
+
+    def step(self, actions):
+        '''VectorEnv.step(actions) -> list, list, list, list
+        steps every environment with its action and returns lists of their
+        observations, rewards, dones and infos
+        a game that is done starts again straight away: its observation is of the new
+        game and the last one of the old game is in info["finalObservation"]'''
+        observations = []
+        rewards = []
+        dones = []
+        infos = []
+        for env, action in zip(self.envs, actions):
+            observation, reward, done, info = env.step(action)
+            if done:
+                info["finalObservation"] = observation
+                observation = env.reset(self.random.randrange(2**63))
+            observations.append(observation)
+            rewards.append(reward)
+            dones.append(done)
+            infos.append(info)
+        return observations, rewards, dones, infos
+
+def random_policy(game, rand):
+    '''random_policy(game, rand) -> None
+    a bot that holds the keys of a random SpaceInvadersEnv action'''
+    controls = game.get_controls()
+    held = rand.choice(SpaceInvadersEnv.actions)
+    for key in Controls.keys:
+        if controls.is_held(key) != (key in held):
+            game.press(key + (" down" if key in held else " up"))
+
+def still_policy(game, rand):
+    '''still_policy(game, rand) -> None
+    a bot that stays in the middle and shoots as often as it can'''
+    if not game.get_controls().is_held("shoot"):
+        game.press("shoot down")
+
+# the bots a playtest can use, by name
+POLICIES = {"autopilot": autopilot, "random": random_policy, "still": still_policy}
+
+def start_playtest_worker(levels):
+    '''start_playtest_worker(levels) -> None
+    reads the level file levels once when a playtest process starts,
+    so its games play them by default, or levels.json if levels is None'''
+    if levels != None:
+        LevelConfig.default = load_levels(levels)
+
+def play_test_game(job):
+    '''play_test_game(job) -> dict
+    plays one game with a bot for a playtest and returns what happened
+    job is a dict with the seed, policy, maxTicks, numLives, botWait and field size of the game,
+    which plays the levels its process was started with'''
+    game = Game(*(job["field"] or ()), numLives=job["numLives"], seed=job["seed"])
+    policy = POLICIES[job["policy"]]
+    rand = random.Random(job["seed"])
+    botTicks = max(job["botWait"]//game.tickTime, 1)
+
+    deaths = [] # game time of every life lost, to the end of the bot's step
+    levelTimes = {} # level -> [ticks, real seconds]
+    lives = game.get_lives()
+    start = time.perf_counter()
+    while game.get_num_ticks() < job["maxTicks"] and not game.is_ended():
+        if game.get_num_ticks() % botTicks == 0:
+            policy(game, rand)
+        level = game.get_level()
+        numTicks = game.get_num_ticks()
+        tickStart = time.perf_counter()
+        game.advance(min((numTicks//botTicks + 1)*botTicks, job["maxTicks"]))
+        levelTime = levelTimes.setdefault(level, [0, 0])
+        levelTime[0] += game.get_num_ticks() - numTicks
+        levelTime[1] += time.perf_counter() - tickStart
+        if game.get_lives() != lives:
+            deaths.extend([game.get_time()]*(lives-game.get_lives()))
+            lives = game.get_lives()
+
+    return {"seed": job["seed"], "level": game.get_level(), "score": game.get_score(),
+        "ticks": game.get_num_ticks(), "gameTime": game.get_time(), "realTime": time.perf_counter()-start,
+        "ended": game.is_ended(), "deaths": deaths,
+        "shieldHits": [shield.get_total_hits() for shield in game.get_shields()],
+        "tickTimes": {level: seconds*1e6/ticks for level, (ticks, seconds) in levelTimes.items()}}
+
+def run_playtest(numGames=64, policy="autopilot", maxTicks=200000, seed=1, numLives=5, botWait=50,
+                 levels=None, numProcesses=None, fileName=None, field=None):
+    '''run_playtest(numGames=64, policy="autopilot", maxTicks=200000, seed=1, numLives=5, botWait=50,
+    levels=None, numProcesses=None, fileName=None, field=None) -> dict
+    plays numGames seeded games with the bot policy on a pool of numProcesses processes
+    (one per core by default), prints a report and saves it and every game as json to fileName
+    levels is the level file to play, levels.json by default, on a field of size field,
+    the level file's by default'''
+    seeds = random.Random(seed)
+    jobs = [{"seed": seeds.randrange(2**63), "policy": policy, "maxTicks": maxTicks, "numLives": numLives,
+        "botWait": botWait, "field": field} for i in range(numGames)]
+
+    start = time.perf_counter()
+    pool = multiprocessing.Pool(numProcesses, start_playtest_worker, (levels,))
+    try:
+        games = pool.map(play_test_game, jobs, chunksize=max(numGames//(4*(numProcesses or os.cpu_count() or 1)), 1))
+    finally:
+        pool.close()
+        pool.join()
+    realTime = time.perf_counter() - start
+
+    # put the games together
+    levels = [game["level"] for game in games]
+    scores = [game["score"] for game in games]
+    firstDeaths = [game["deaths"][0] for game in games if len(game["deaths"]) != 0]
+    endTimes = [game["gameTime"] for game in games if game["ended"]]
+    numShields = max((len(game["shieldHits"]) for game in games), default=0)
+    shieldHits = [sum(game["shieldHits"][index] for game in games)/max(numGames, 1) for index in range(numShields)]
+    tickTimes = {}
+    for game in games:
+        for level, micros in game["tickTimes"].items():
+            tickTimes.setdefault(level, []).append(micros)
+
+    report = {"games": numGames, "policy": policy, "maxTicks": maxTicks, "seed": seed, "realTime": realTime,
+        "gameTime": sum(game["gameTime"] for game in games), "ended": len(endTimes),
+        "level": {"mean": sum(levels)/max(numGames, 1), "p50": percentile(levels, 0.5), "max": max(levels, default=0),
+            "counts": {level: levels.count(level) for level in sorted(set(levels))}},
+        "score": {"mean": sum(scores)/max(numGames, 1), "p50": percentile(scores, 0.5),
+            "p95": percentile(scores, 0.95), "max": max(scores, default=0)},
+        "firstDeath": {"mean": sum(firstDeaths)/max(len(firstDeaths), 1), "p50": percentile(firstDeaths, 0.5)},
+        "timeToEnd": {"mean": sum(endTimes)/max(len(endTimes), 1), "p50": percentile(endTimes, 0.5)},
+        "shieldHits": shieldHits,
+        "tickMicros": {level: sum(times)/len(times) for level, times in sorted(tickTimes.items())},
+        "results": games}
+
+    print("{} games of {} in {:.1f} s ({:.0f}x real time), {} ended".format(numGames, policy, realTime,
+        report["gameTime"]/max(realTime, 1e-9), len(endTimes)))
+    print("level   mean {:.2f}  p50 {}  max {}".format(report["level"]["mean"], report["level"]["p50"],
+        report["level"]["max"]))
+    print("score   mean {:.0f}  p50 {}  p95 {}  max {}".format(report["score"]["mean"], report["score"]["p50"],
+        report["score"]["p95"], report["score"]["max"]))
+    print("first death  mean {:.1f} s   game over  mean {:.1f} s".format(report["firstDeath"]["mean"],
+        report["timeToEnd"]["mean"]))
+    print("shield hits per game  " + "  ".join("{:.1f}".format(hits) for hits in shieldHits))
+    print("{:<8}{:>8}{:>14}".format("level", "games", "us per tick"))
+    for level, micros in report["tickMicros"].items():
+        print("{:<8}{:>8}{:>14.1f}".format(level, len(tickTimes[level]), micros))
+
+    if fileName != None:
+        file = open(fileName, "w")
+        json.dump(report, file, indent=2)
         file.close()
+    return report
+
+# the game each benchmark scenario plays, then what it changes
+BENCHMARK_DEFAULTS = {"numBullets": 3, "numAlienBullets": 2, "numRows": 6, "numHoles": 0,
+    "playerCooldown": None, "alienCooldown": None}
+# the bullet scenarios shoot with almost no cooldown, or the cooldowns would keep
+# the same few bullets in flight however many there are
+BENCHMARK_SCENARIOS = [{"name": "default"},
+    {"name": "12 player bullets", "numBullets": 12, "playerCooldown": 0.01},
+    {"name": "48 player bullets", "numBullets": 48, "playerCooldown": 0.01},
+    {"name": "8 alien bullets", "numAlienBullets": 8, "alienCooldown": 0.01},
+    {"name": "32 alien bullets", "numAlienBullets": 32, "alienCooldown": 0.01},
+    {"name": "12 rows", "numRows": 12}, {"name": "24 rows", "numRows": 24},
+    {"name": "50 holes", "numHoles": 50}, {"name": "200 holes", "numHoles": 200}]
+
+def make_benchmark_game(scenario, seed):
+    '''make_benchmark_game(scenario, seed) -> Game
+    makes the game for a benchmark scenario with shields already shot numHoles times,
+    the cooldowns of every level replaced by the scenario's and a field tall enough for its rows'''
+    knobs = dict(BENCHMARK_DEFAULTS)
+    knobs.update(scenario)
+    cooldowns = {name: knobs[name] for name in ("playerCooldown", "alienCooldown") if knobs[name] != None}
+    levels = load_levels().replace(**cooldowns)
+    # more rows than the level file's come with a taller field to hold them
+    height = levels.height + math.ceil(max(knobs["numRows"] - levels.numRows, 0)*levels.rowSpacing)
+    game = Game(height=height, numLives=10**6, seed=seed, numBullets=knobs["numBullets"],
+        numAlienBullets=knobs["numAlienBullets"], numRows=knobs["numRows"], levels=levels)
+
+    for shield in game.get_shields():
+        for hole in range(knobs["numHoles"]):
+            shield.carve(shield.x + game.get_random().uniform(-shield.width/2, shield.width/2),
+                shield.y + game.get_random().uniform(-shield.height/2, shield.height/2), 16)
+    return game
+
+def percentile(values, fraction):
+    '''percentile(values, fraction) -> float
+    returns the value that fraction of the sorted values are below'''
+    if len(values) == 0:
+        return 0
+    values = sorted(values)
+    return values[min(int(len(values)*fraction), len(values)-1)]
+
+def benchmark_scenario(scenario, numTicks=4000, seed=1, canvas=None, frameTicks=3, assets=None,
+                       framebuffer=False):
+    '''benchmark_scenario(scenario, numTicks=4000, seed=1, canvas=None, frameTicks=3, assets=None,
+    framebuffer=False) -> dict
+    plays a scenario with the bot and returns its timings in milliseconds
+    if canvas is a Canvas the game is also drawn with assets every frameTicks ticks,
+    or into a Framebuffer if framebuffer is True'''
+    # timing run
+    game = make_benchmark_game(scenario, seed)
+    renderer = None
+    if assets == None:
+        assets = load_assets()
+    if canvas != None:
+        canvas.delete("all")
+        renderer = GameRenderer(game, canvas, "", assets)
+    elif framebuffer:
+        renderer = FramebufferRenderer(game, assets)
+    rand = random.Random(seed)
+    tickTimes = []
+    renderTimes = []
+    numItems = 0
+    maxBullets = 0 # most bullets in flight at once, to see that the scenario is as busy as it says
+
+    while game.get_num_ticks() < numTicks and not game.is_ended():
+        if game.get_num_ticks() % 10 == 0:
+            autopilot(game, rand)
+        start = time.perf_counter()
+        game.tick()
+        tickTimes.append((time.perf_counter()-start)*1000)
+        maxBullets = max(maxBullets, sum(bullet.is_moving() for bullet in game.get_bullets()))
+
+        if renderer != None and game.get_num_ticks() % frameTicks == 0:
+            start = time.perf_counter()
+            renderer.draw()
+            if canvas != None:
+                canvas.update_idletasks()
+                numItems = max(numItems, len(canvas.find_all()))
+            else:
+                numItems = max(numItems, renderer.get_num_items())
+            renderTimes.append((time.perf_counter()-start)*1000)
+
+    # memory run: the same game again while tracing allocations
+    tracemalloc.start()
+    game = make_benchmark_game(scenario, seed)
+    rand = random.Random(seed)
+    while game.get_num_ticks() < len(tickTimes):
+        if game.get_num_ticks() % 10 == 0:
+            autopilot(game, rand)
+        game.tick()
+    memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    results = dict(BENCHMARK_DEFAULTS)
+    results.update(scenario)
+    results.update({"ticks": len(tickTimes), "maxBullets": maxBullets, "tickMean": sum(tickTimes)/max(len(tickTimes), 1),
+        "tickP95": percentile(tickTimes, 0.95), "tickMax": max(tickTimes, default=0),
+        "memoryCurrent": memory[0], "memoryPeak": memory[1]})
+    if renderer != None:
+        results.update({"frames": len(renderTimes), "renderMean": sum(renderTimes)/max(len(renderTimes), 1),
+            "renderP95": percentile(renderTimes, 0.95), "renderMax": max(renderTimes, default=0),
+            "canvasItems": numItems})
+    return results
+
+def run_benchmark(fileName=None, numTicks=4000, seed=1, render=True, baseline=None):
+    '''run_benchmark(fileName=None, numTicks=4000, seed=1, render=True, baseline=None) -> dict
+    runs every benchmark scenario, drawing them if render is True and there is a display,
+    prints a table, compares with the results in the baseline file and saves to fileName'''
+    canvas = None
+    if render:
+        try:
+            root = Tk()
+            root.title("Space Invaders Benchmark")
+            levels = load_levels()
+            canvas = Viewport(levels.width, levels.height).make_canvas(root)
+            canvas.grid()
+        except TclError:
+            print("no display: drawing the game into a framebuffer")
+
+    # git commit, so results can be told apart
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+            cwd=ASSET_DIR).stdout.strip()
+    except OSError:
+        commit = ""
+
+    report = {"commit": commit, "python": sys.version.split()[0], "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "numTicks": numTicks, "seed": seed, "scenarios": []}
+    old = {}
+    if baseline != None:
+        file = open(baseline)
+        old = {scenario["name"]: scenario for scenario in json.load(file)["scenarios"]}
+        file.close()
+
+    print("{:<20}{:>8}{:>9}{:>12}{:>12}{:>12}{:>8}{:>12}{:>10}".format("scenario", "ticks", "bullets", "tick ms",
+        "tick p95", "render ms", "items", "peak KiB", "vs base" if baseline != None else ""))
+    for scenario in BENCHMARK_SCENARIOS:
+        results = benchmark_scenario(scenario, numTicks, seed, canvas, framebuffer=render)
+        report["scenarios"].append(results)
+        line = "{:<20}{:>8}{:>9}{:>12.4f}{:>12.4f}{:>12}{:>8}{:>12.1f}".format(results["name"], results["ticks"],
+            results["maxBullets"], results["tickMean"], results["tickP95"], "{:.4f}".format(results["renderMean"]) if "renderMean" in results else "-",
+            results.get("canvasItems", "-"), results["memoryPeak"]/1024)
+        if results["name"] in old:
+            line += "{:>+10.1%}".format(results["tickMean"]/max(old[results["name"]]["tickMean"], 1e-9) - 1)
+        print(line)
+
+    if fileName != None:
+        file = open(fileName, "w")
+        json.dump(report, file, indent=2)
+        file.close()
+    if canvas != None:
+        root.destroy()
+    return report
+
+def main():
+    '''main() -> None
+    runs space invaders in a window, or headless from the command line'''
+    parser = argparse.ArgumentParser(description="Space Invaders")
+    parser.add_argument("--headless", action="store_true",
+        help="play a game with a bot and no display, as fast as possible")
+    parser.add_argument("--ticks", type=int,
+        help="most simulation ticks to run when headless (1000000) or per benchmark scenario (4000)")
+    parser.add_argument("--seed", type=int, help="seed for the game's randomness")
+    parser.add_argument("--record", metavar="FILE", help="save a replay of the game to FILE")
+    parser.add_argument("--replay", metavar="FILE",
+        help="watch the replay in FILE, or play it back as fast as possible with --headless")
+    parser.add_argument("--benchmark", nargs="?", const="", metavar="FILE",
+        help="time the game as it gets busier, saving the results as json to FILE")
+    parser.add_argument("--baseline", metavar="FILE", help="benchmark results to compare with")
+    parser.add_argument("--no-render", action="store_true", help="benchmark without drawing")
+    parser.add_argument("--profile", action="store_true", help="show the profiler from the start (F3 toggles it)")
+    parser.add_argument("--profile-dump", metavar="FILE",
+        help="profile the game and save histograms of the last frames as json to FILE on exit")
+    parser.add_argument("--playtest", nargs="?", const="", metavar="FILE",
+        help="play many games with a bot on every core, print a report and save it as json to FILE")
+    parser.add_argument("--games", type=int, default=64, help="number of games to playtest (default: 64)")
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="autopilot", help="bot to playtest with")
+    parser.add_argument("--processes", type=int, help="processes to playtest on (default: one per core)")
+    parser.add_argument("--levels", metavar="FILE", help="play the levels in FILE instead of levels.json")
+    parser.add_argument("--size", metavar="WIDTHxHEIGHT",
+        help="size of the window in pixels, the field is scaled to fit (default: the size of the field)")
+    parser.add_argument("--field", metavar="WIDTHxHEIGHT",
+        help="size of the playing field in world units (default: the size in the level file)")
+    parser.add_argument("--render-frames", metavar="FOLDER",
+        help="play headless and save the frames as numbered images in FOLDER")
+    parser.add_argument("--render-video", metavar="FILE",
+        help="play headless and write the frames as raw rgb24 video to FILE, or - for stdout")
+    parser.add_argument("--fps", type=int, default=30, help="frames per second of game time to render (default: 30)")
+    parser.add_argument("--frame-format", choices=("png", "ppm"), default="png",
+        help="image format of --render-frames (default: png)")
+    args = parser.parse_args()
+
+    sizes = {}
+    for option, example in (("size", "1500x1050"), ("field", "800x600")):
+        text = getattr(args, option)
+        if text != None:
+            try:
+                sizes[option] = tuple(int(number) for number in text.lower().split("x"))
+            except ValueError:
+                sizes[option] = ()
+            if len(sizes[option]) != 2 or min(sizes[option]) < 1:
+                parser.error("--"+option+" must look like "+example)
+    size = sizes.get("size")
+    field = sizes.get("field")
+
+    if args.levels != None:
+        try:
+            LevelConfig.default = load_levels(args.levels)
+        except (ValueError, OSError) as error:
+            parser.error(str(error))
+    if field != None:
+        try:
+            load_levels().check_field(*field)
+        except ValueError as error:
+            parser.error(str(error))
+
+    if args.playtest != None:
+        run_playtest(args.games, args.policy, args.ticks or 200000, args.seed or 1, levels=args.levels,
+            numProcesses=args.processes, fileName=args.playtest or None, field=field)
+        return
+
+    if args.benchmark != None:
+        run_benchmark(args.benchmark or None, args.ticks or 4000, args.seed or 1,
+            not args.no_render, args.baseline)
+        return
+
+    replay = None
+    if args.replay != None:
+        try:
+            replay = load_replay(args.replay)
+            replay.check(load_levels())
+        except ValueError as error:
+            parser.error(str(error))
+
+    writer = None
+    output = sys.stdout
+    if args.render_frames != None or args.render_video != None:
+        if args.fps < 1:
+            parser.error("--fps must be at least 1")
+        if args.render_frames != None:
+            writer = FrameWriter(args.fps, args.render_frames, kind=args.frame_format, size=size)
+        elif args.render_video == "-":
+            writer = FrameWriter(args.fps, stream=sys.stdout.buffer, size=size)
+            output = sys.stderr
+        else:
+            stream = open(args.render_video, "wb")
+            writer = FrameWriter(args.fps, stream=stream, size=size)
+
+    if args.headless or writer != None:
+        results, game = run_headless(args.ticks or 1000000, seed=args.seed, replay=replay, writer=writer, field=field)
+        for key, value in results.items():
+            print(key+":", value, file=output)
+        if args.render_video not in (None, "-"):
+            stream.close()
+            width, height = writer.get_renderer().get_frame().get_size()
+            print("play with: ffplay -f rawvideo -pixel_format rgb24 -video_size {}x{} -framerate {} {}".format(
+                width, height, args.fps, args.render_video), file=output)
+        if args.record != None:
+            game.get_replay().save(args.record)
+        return
+
+    root = Tk()
+    root.title("Space Invaders")
+    root.iconbitmap("hourglass")
 
-root = Tk()
-root.title("Space Invaders")
-root.iconbitmap("hourglass")
+    frame = SpaceInvadersFrame(root, seed=args.seed, replay=replay, recordFile=args.record,
+        profile=args.profile or args.profile_dump != None, size=size, field=field)
+    if args.profile:
+        print(frame.get_assets().get_report())
+    mainloop()
+    frame.close()
+    # the window is gone, so there is nothing to keep smooth and errors are seen
+    if args.profile_dump != None:
+        frame.get_profiler().dump(args.profile_dump)
+    quit()
 
-SpaceInvadersFrame(root)
-mainloop()
-quit()
+if __name__ == "__main__":
+    main()